@@ -4,42 +4,37 @@ GitPilot 2.0.0 Manual Test Demonstration
 Shows how to use the new features interactively
 """
 
-import json
-from rich.console import Console
+from concurrent.futures import Future, ThreadPoolExecutor
+from rich.console import Console, Group
 from rich.panel import Panel
-from rich.prompt import Prompt, Confirm
+from rich.prompt import Confirm
 
 # Import GitPilot modules
 from gitpilot.repo_health import RepositoryHealthMonitor
 from gitpilot.context_analyzer import ContextAnalyzer
-from gitpilot.ai_engine import AIEngine
 from gitpilot.cli import display_health_report, display_graph_tree
 
 console = Console()
 
-def demo_health_check():
+def demo_health_check(report_future: Future):
     """Demonstrate repository health checking"""
     console.print("\n🏥 [bold blue]Repository Health Check Demo[/bold blue]")
     console.print("=" * 50)
     
-    monitor = RepositoryHealthMonitor()
-    
     with console.status("🔍 Analyzing repository health..."):
-        report = monitor.get_comprehensive_health_report()
+        report = report_future.result()
     
     display_health_report(report)
     
     return Confirm.ask("\n🔄 Continue to next demo?")
 
-def demo_git_graph():
+def demo_git_graph(graph_future: Future):
     """Demonstrate Git graph visualization"""
     console.print("\n📊 [bold blue]Git Graph Visualization Demo[/bold blue]")
     console.print("=" * 50)
     
-    analyzer = ContextAnalyzer()
-    
     with console.status("📊 Generating Git graph..."):
-        graph_data = analyzer.get_git_graph_data(max_commits=15)
+        graph_data = graph_future.result()
     
     if "error" not in graph_data:
         display_graph_tree(graph_data)
@@ -48,15 +43,13 @@ def demo_git_graph():
     
     return Confirm.ask("\n🔄 Continue to next demo?")
 
-def demo_security_scan():
+def demo_security_scan(security_future: Future):
     """Demonstrate security scanning"""
     console.print("\n🔒 [bold blue]Security Scan Demo[/bold blue]")
     console.print("=" * 50)
     
-    monitor = RepositoryHealthMonitor()
-    
     with console.status("🔍 Running security scan..."):
-        security_results = monitor.get_security_scan_results()
+        security_results = security_future.result()
     
     if "error" in security_results:
         console.print(f"❌ Error: {security_results['error']}", style="red")
@@ -82,24 +75,22 @@ def demo_security_scan():
     
     return Confirm.ask("\n🔄 Continue to next demo?")
 
-def demo_commit_history():
+def demo_commit_history(commits_future: Future, context_future: Future):
     """Demonstrate commit history analysis"""
     console.print("\n📚 [bold blue]Commit History Analysis Demo[/bold blue]")
     console.print("=" * 50)
     
-    analyzer = ContextAnalyzer()
-    
     with console.status("📚 Analyzing commit history..."):
-        commits = analyzer.get_commit_history_for_search(10)
+        commits = commits_future.result()
         
         # Also get detailed analysis
-        context = analyzer.analyze_context()
+        context = context_future.result()
         last_commit = context.get("last_commit", {})
     
-    console.print(f"📋 Found {len(commits)} recent commits")
+    output = [f"📋 Found {len(commits)} recent commits"]
     
     if last_commit:
-        console.print(Panel(
+        output.append(Panel(
             f"🔄 Last Commit: [{last_commit.get('sha', 'unknown')}]\\n"
             f"📝 Message: {last_commit.get('message', 'No message')}\\n"
             f"👤 Author: {last_commit.get('author', 'Unknown')}\\n"
@@ -109,36 +100,34 @@ def demo_commit_history():
         ))
     
     # Show recent commit messages
-    console.print("\n📝 [bold cyan]Recent Commit Messages:[/bold cyan]")
-    for i, commit in enumerate(commits[:5], 1):
-        parts = commit.split(" | ")
-        if len(parts) >= 4:
-            sha, author, date, message = parts[:4]
-            console.print(f"{i}. [{sha[:8]}] {message[:60]}... ({author}, {date})")
+    output.append("\n📝 [bold cyan]Recent Commit Messages:[/bold cyan]")
+    for i, (sha, author, date, message) in enumerate(commits[:5], 1):
+        output.append(f"{i}. [{sha[:8]}] {message[:60]}... ({author}, {date})")
     
+    console.print(Group(*output))
     return True
 
-def demo_performance_analysis():
+def demo_performance_analysis(perf_future: Future):
     """Demonstrate performance analysis"""
     console.print("\n⚡ [bold blue]Performance Analysis Demo[/bold blue]")
     console.print("=" * 50)
     
-    monitor = RepositoryHealthMonitor()
-    
     with console.status("⚡ Analyzing performance..."):
-        perf_results = monitor.get_performance_metrics()
+        perf_results = perf_future.result()
     
     if "error" in perf_results:
         console.print(f"❌ Error: {perf_results['error']}", style="red")
         return True
     
+    lines = []
+    
     # Repository size info
     repo_size = perf_results.get("repository_size", {})
     if repo_size:
-        console.print("📦 [bold]Repository Size Analysis:[/bold]")
-        console.print(f"  • Total size: {repo_size.get('total_size_mb', 0):.1f} MB")
-        console.print(f"  • Working tree: {repo_size.get('working_tree_size_mb', 0):.1f} MB")
-        console.print(f"  • Git database: {repo_size.get('git_size_mb', 0):.1f} MB")
+        lines.append("📦 [bold]Repository Size Analysis:[/bold]")
+        lines.append(f"  • Total size: {repo_size.get('total_size_mb', 0):.1f} MB")
+        lines.append(f"  • Working tree: {repo_size.get('working_tree_size_mb', 0):.1f} MB")
+        lines.append(f"  • Git database: {repo_size.get('git_size_mb', 0):.1f} MB")
     
     # Tracking efficiency
     tracking = perf_results.get("tracking_efficiency", {})
@@ -147,10 +136,10 @@ def demo_performance_analysis():
         untracked = tracking.get("untracked_files", 0)
         has_gitignore = tracking.get("has_gitignore", False)
         
-        console.print("\n📊 [bold]Tracking Efficiency:[/bold]")
-        console.print(f"  • Tracking ratio: {ratio:.1%}")
-        console.print(f"  • Untracked files: {untracked}")
-        console.print(f"  • Has .gitignore: {'✅ Yes' if has_gitignore else '❌ No'}")
+        lines.append("\n📊 [bold]Tracking Efficiency:[/bold]")
+        lines.append(f"  • Tracking ratio: {ratio:.1%}")
+        lines.append(f"  • Untracked files: {untracked}")
+        lines.append(f"  • Has .gitignore: {'✅ Yes' if has_gitignore else '❌ No'}")
     
     # Branch health
     branch_health = perf_results.get("branch_health", {})
@@ -159,11 +148,13 @@ def demo_performance_analysis():
         health = branch_health.get("health", "unknown")
         recommendation = branch_health.get("recommendation", "No recommendation")
         
-        console.print("\n🌳 [bold]Branch Health:[/bold]")
-        console.print(f"  • Total branches: {total_branches}")
-        console.print(f"  • Health status: {health}")
-        console.print(f"  • Recommendation: {recommendation}")
+        lines.append("\n🌳 [bold]Branch Health:[/bold]")
+        lines.append(f"  • Total branches: {total_branches}")
+        lines.append(f"  • Health status: {health}")
+        lines.append(f"  • Recommendation: {recommendation}")
     
+    if lines:
+        console.print("\n".join(lines))
     return True
 
 def main():
@@ -172,17 +163,31 @@ def main():
     console.print("This demo showcases the new features in GitPilot 2.0.0")
     console.print("=" * 60)
     
+    # Each analyzer gets its own repository handle; they are created here and
+    # only their read-only queries run on the worker threads.
+    executor = ThreadPoolExecutor(max_workers=5)
     demos = [
-        ("Repository Health Check", demo_health_check),
-        ("Git Graph Visualization", demo_git_graph),
-        ("Security Analysis", demo_security_scan),
-        ("Commit History Analysis", demo_commit_history),
-        ("Performance Analysis", demo_performance_analysis)
+        ("Repository Health Check", demo_health_check, (
+            executor.submit(RepositoryHealthMonitor().get_comprehensive_health_report),
+        )),
+        ("Git Graph Visualization", demo_git_graph, (
+            executor.submit(ContextAnalyzer().get_git_graph_data, max_commits=15),
+        )),
+        ("Security Analysis", demo_security_scan, (
+            executor.submit(RepositoryHealthMonitor().get_security_scan_results),
+        )),
+        ("Commit History Analysis", demo_commit_history, (
+            executor.submit(ContextAnalyzer().get_commit_records, 10),
+            executor.submit(ContextAnalyzer().analyze_context),
+        )),
+        ("Performance Analysis", demo_performance_analysis, (
+            executor.submit(RepositoryHealthMonitor().get_performance_metrics),
+        ))
     ]
     
-    for demo_name, demo_func in demos:
+    for demo_name, demo_func, futures in demos:
         try:
-            if not demo_func():
+            if not demo_func(*futures):
                 console.print("\n👋 Demo ended by user choice.")
                 break
         except KeyboardInterrupt:
@@ -193,6 +198,11 @@ def main():
             if not Confirm.ask("Continue with next demo?"):
                 break
     
+    for _, _, futures in demos:
+        for future in futures:
+            future.cancel()
+    executor.shutdown(wait=False)
+    
     console.print("\n🎉 [bold green]Demo completed! Here's what GitPilot 2.0.0 offers:[/bold green]")
     console.print("  ✅ Comprehensive repository health monitoring")
     console.print("  ✅ Visual Git graph with branch relationships")
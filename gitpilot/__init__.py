@@ -1,9 +1,23 @@
 __version__ = "2.0.0"
 __author__ = "Anubhav Saxena"
 __email__ = "saxenaanubhav1204@gmail.com"
-from .ai_engine import AIEngine
-from .cli import main
-from .context_analyzer import ContextAnalyzer
-from .git_executor import GitExecutor
 
 __all__ = ["main", "AIEngine", "GitExecutor", "ContextAnalyzer"]
+
+# Exports load on first access, so importing gitpilot.cli does not pull in the AI engine.
+_EXPORTS = {
+    "main": ".cli",
+    "AIEngine": ".ai_engine",
+    "GitExecutor": ".git_executor",
+    "ContextAnalyzer": ".context_analyzer",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
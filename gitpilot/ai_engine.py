@@ -1,82 +1,577 @@
+import asyncio
+import copy
+import hashlib
+import importlib.util
 import json
 import os
-from typing import Dict, List, Optional
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
+from string import Formatter
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
 
-import google.generativeai as genai
-from groq import Groq
+try:
+    from orjson import OPT_INDENT_2, OPT_NON_STR_KEYS, OPT_SORT_KEYS, dumps as _orjson_dumps, loads as json_loads
 
+    def _canonical_json(value) -> bytes:
+        return _orjson_dumps(value, default=str, option=OPT_SORT_KEYS | OPT_NON_STR_KEYS)
+
+    def _indented_json(value) -> str:
+        return _orjson_dumps(value, option=OPT_INDENT_2 | OPT_NON_STR_KEYS).decode()
+except ImportError:
+    from json import loads as json_loads
+
+    def _canonical_json(value) -> bytes:
+        return json.dumps(value, sort_keys=True, default=str).encode()
+
+    def _indented_json(value) -> str:
+        return json.dumps(value, indent=2)
+
+# google-re2 scans in linear time; every reply pattern below avoids lookaround
+# and uses inline flags so either engine accepts it.
+try:
+    import re2 as _reply_re
+except ImportError:
+    _reply_re = re
+
+from .llm_cache import LLMCache
 from .logger import GitPilotLogger
-from .prompts import CONTEXT_PROMPT
+from .ratelimit import TokenBucket
+from .models import AVAILABLE_MODELS as _AVAILABLE_MODELS
+from .prompts import CONFLICT_EXCERPT_CHARS, CONTEXT_PROMPT
+
+if TYPE_CHECKING:
+    import google.generativeai as genai
+
+# (provider, model) per menu choice, resolved once instead of per request.
+_MODEL_ROUTES = MappingProxyType({
+    choice: (model_info["provider"], model_info["model"]) for choice, model_info in _AVAILABLE_MODELS.items()
+})
+# Unknown choices fall back to the first menu entry.
+_DEFAULT_ROUTE = _MODEL_ROUTES["1"]
+
+# Parsed command responses kept per engine, least recently used evicted first.
+_RESPONSE_CACHE_SIZE = 128
+_RESPONSE_CACHE_TTL = 24 * 60 * 60
+# Politeness that can lead a request without changing which git command it maps to.
+# Everything after it, case and symbols included, is kept: it may be a branch, revision or message.
+_POLITE_PREFIX_RE = re.compile(
+    r"(?:(?:please|pls|kindly|just|(?:can|could|would) you)\s+)+", re.IGNORECASE
+)
+_TRAILING_PUNCTUATION = "!?"
+
+_HTTP_KEEPALIVE_CONNECTIONS = 20
+_HTTP_CONNECT_RETRIES = 2
+# Concurrent requests share one multiplexed connection when the h2 package is installed.
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Client-side request quotas per provider (free-tier limits), overridable per engine.
+_DEFAULT_RPM = MappingProxyType({"groq": 30, "gemini": 60})
+# Rate-limited calls are retried after 1s, 2s and 4s.
+_RATE_LIMIT_RETRIES = 3
+_RATE_LIMIT_BACKOFF = 1.0
+# Commit search sends the history in slices this size, several requests at a time,
+# so each reply fits its token budget however long the history is.
+_SEARCH_CHUNK_SIZE = 20
+_SEARCH_CONCURRENCY = 4
+# Only the newest commits are searched, so one search costs at most five requests.
+_SEARCH_MAX_COMMITS = 100
+
+# Connection state shared by every AIEngine in the process.
+_http_client = None
+_gemini_configured_key = object()
+
+
+def _shared_http_client():
+    """Return the pooled HTTP client handed to the Groq SDK, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        import atexit
+        import httpx
+        from groq import DefaultHttpxClient
+        # The transport owns the pool; its retries only cover failed connection attempts.
+        transport = httpx.HTTPTransport(
+            http2=_HTTP2,
+            retries=_HTTP_CONNECT_RETRIES,
+            limits=httpx.Limits(max_keepalive_connections=_HTTP_KEEPALIVE_CONNECTIONS),
+        )
+        _http_client = DefaultHttpxClient(transport=transport)
+        atexit.register(_http_client.close)
+    return _http_client
+
+
+def _async_groq_client(api_key: Optional[str]):
+    """Return an AsyncGroq pooling connections like the sync client; the caller closes it.
+
+    httpx async clients are bound to the event loop they first run on, so unlike the
+    sync client this one is not shared across calls.
+    """
+    import httpx
+    from groq import AsyncGroq, DefaultAsyncHttpxClient
+    transport = httpx.AsyncHTTPTransport(
+        http2=_HTTP2,
+        retries=_HTTP_CONNECT_RETRIES,
+        limits=httpx.Limits(max_keepalive_connections=_HTTP_KEEPALIVE_CONNECTIONS),
+    )
+    return AsyncGroq(api_key=api_key, http_client=DefaultAsyncHttpxClient(transport=transport))
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """Whether a provider error is an HTTP 429 (groq's status_code, google api_core's code)."""
+    return getattr(error, "status_code", None) == 429 or getattr(error, "code", None) == 429
+
+
+def _relevance(match: Dict) -> float:
+    try:
+        return float(match.get("relevance_score", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _gemini_text(response) -> str:
+    """Return the text of a Gemini response or stream chunk."""
+    try:
+        return response.text
+    except AttributeError:
+        return str(response)
+
+
+# Groq system messages, built once and shared by every request. They lead every
+# message list byte-for-byte, so providers that cache prompt prefixes can reuse them;
+# keep anything request-specific out of them.
+_COMMAND_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are GitPilot, an AI assistant that converts natural language to Git commands. CRITICAL: Always respond with ONLY a valid JSON object in this exact format: {\"command\": \"git ...\", \"explanation\": \"...\", \"warning\": \"...\" or null}. The command should be a valid Git command or null if no command can be generated. Do not include any text before or after the JSON object."
+}
+_CONFLICT_SYSTEM_MESSAGE = {"role": "system", "content": "You are GitPilot, an expert Git merge conflict resolver. Always respond with valid JSON."}
+_SEARCH_SYSTEM_MESSAGE = {"role": "system", "content": "You are GitPilot, a semantic commit search assistant. Always respond with valid JSON."}
+_HEALTH_SYSTEM_MESSAGE = {"role": "system", "content": "You are GitPilot, a repository health analyst. Always respond with valid JSON."}
+
+# CONTEXT_PROMPT parsed once into (literal, field) pairs; _build_prompt only joins them.
+# Value rendered for each CONTEXT_PROMPT field the context dict lacks.
+_CONTEXT_PROMPT_DEFAULTS = {
+    "branch": "unknown",
+    "is_dirty": False,
+    "staged_files": 0,
+    "unstaged_files": 0,
+    "is_detached": False,
+    "remote_status": {},
+}
+_CONTEXT_PROMPT_PARTS = tuple(
+    (literal, field, _CONTEXT_PROMPT_DEFAULTS.get(field))
+    for literal, field, _, _ in Formatter().parse(CONTEXT_PROMPT)
+)
+# Context fields the prompt actually renders; nothing else can change the answer.
+_PROMPT_CONTEXT_FIELDS = tuple(field for _, field, _ in _CONTEXT_PROMPT_PARTS if field and field != "user_input")
+
+# Replies that are a bare JSON object; tested without stripping a copy of the reply.
+_LEADING_BRACE_RE = re.compile(r'\s*\{')
+# Characters that matter when walking a reply for a balanced JSON object.
+_JSON_TOKEN_RE = _reply_re.compile(r'[{}"\\]')
+# Outermost "{...}" span of a conflict, search or health reply, for when no
+# balanced object parses.
+_JSON_SPAN_RE = _reply_re.compile(r'(?s)\{.*\}')
+
+# Fallback parsing of non-JSON replies, one sweep over the whole text per pattern.
+# The command comes from the first line that starts with "git ", holds a `git ...`
+# span, or mentions "git ..." on a code-fence or "label:" line (the colon may
+# follow or precede the mention).
+_COMMAND_RE = _reply_re.compile(
+    r'(?m)^[ \t]*(?:(git [^\n]*)'
+    r'|[^\n]*?`(git [^`\n]+)`'
+    r'|```[^\n]*?(git [^\n]*)'
+    r'|[^\n]*?(git [^\n]*:[^\n]*)'
+    r'|[^\n:]*:[^\n]*?(git [^\n]*))'
+)
+# The warning is the last "Warning:"-style line, else the first line mentioning one.
+_WARNING_PREFIXES = ("Warning:", "Note:", "⚠️", "WARNING:")
+# One pass over the lines: a prefixed line, or failing that any line mentioning a warning.
+_WARNING_RE = _reply_re.compile(
+    r'(?m)^(?:[ \t]*(?P<prefixed>(?:%s)[^\n]*)|(?P<mention>[^\n]*(?i:warning)[^\n]*))'
+    % "|".join(map(re.escape, _WARNING_PREFIXES))
+)
+# Lines with these prefixes never count toward the explanation.
+_NON_EXPLANATION_PREFIXES = ("```", "`") + _WARNING_PREFIXES
 
 
 class AIEngine:
-    def __init__(self, api_key: Optional[str] = None, groq_api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, groq_api_key: Optional[str] = None, use_cache: bool = True,
+                 requests_per_minute: Optional[Dict[str, float]] = None):
         self.logger = GitPilotLogger()
-        genai.configure(api_key=api_key or os.getenv("GEMINI_API_KEY"))
-        self.gemini_client = genai
-        self.groq_client = Groq(api_key=groq_api_key or os.getenv("GROQ_API_KEY"))
-        self.available_models = {
-            "1": {"name": "Gemini 2.0 Flash", "provider": "gemini", "model": "gemini-2.0-flash"},
-            "2": {"name": "Llama 3.1 8B Instant", "provider": "groq", "model": "llama-3.1-8b-instant"},
-            "3": {"name": "Llama 3.3 70B Versatile", "provider": "groq", "model": "llama-3.3-70b-versatile"},
-            "4": {"name": "DeepSeek R1 Distill Llama 70B", "provider": "groq", "model": "deepseek-r1-distill-llama-70b"}
+        self._use_cache = use_cache
+        self._rate_limits = {
+            provider: TokenBucket(rpm) for provider, rpm in {**_DEFAULT_RPM, **(requests_per_minute or {})}.items()
+        }
+        self._gemini_api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self._groq_api_key = groq_api_key or os.getenv("GROQ_API_KEY")
+        self._gemini_models: Dict[str, "genai.GenerativeModel"] = {}
+        self._response_cache: "OrderedDict[bytes, Tuple[float, Dict]]" = OrderedDict()
+        self._semantic_cache: "OrderedDict[bytes, Tuple[float, Dict]]" = OrderedDict()
+        # Requests being generated right now, so an identical concurrent call waits instead of re-sending.
+        self._inflight: Dict[bytes, Future] = {}
+        self._lock = threading.Lock()
+        self.available_models = _AVAILABLE_MODELS
+        generators = {"gemini": self._generate_with_gemini, "groq": self._generate_with_groq}
+        self._dispatch = {
+            choice: (generators[provider], model_name) for choice, (provider, model_name) in _MODEL_ROUTES.items()
         }
+    # The provider SDKs are heavy to import, so each loads on first use of its provider.
+    @cached_property
+    def gemini_client(self):
+        import google.generativeai as genai
+        global _gemini_configured_key
+        # Reconfiguring drops genai's cached clients and their open channels, so only do it on a key change.
+        if self._gemini_api_key != _gemini_configured_key:
+            genai.configure(api_key=self._gemini_api_key)
+            _gemini_configured_key = self._gemini_api_key
+        return genai
+    @cached_property
+    def groq_client(self):
+        from groq import Groq
+        return Groq(api_key=self._groq_api_key, http_client=_shared_http_client())
+    @cached_property
+    def _reply_cache(self) -> Optional[LLMCache]:
+        if not self._use_cache:
+            return None
+        try:
+            return LLMCache()
+        except (OSError, sqlite3.Error) as e:
+            self.logger.log_warning("Response cache unavailable: {}", e)
+            return None
     def get_available_models(self) -> Dict:
         return self.available_models
-    def generate_command(self, user_input: str, context: Dict, model_choice: str = "1") -> Dict:
+    def generate_command(self, user_input: str, context: Dict, model_choice: str = "1",
+                         on_text: Optional[Callable[[str], None]] = None) -> Dict:
+        """Translate a request into a git command; on_text sees reply text as it streams in."""
         try:
-            model_info = self.available_models.get(model_choice, self.available_models["1"])
-            if model_info["provider"] == "gemini":
-                return self._generate_with_gemini(user_input, context, model_info["model"])
-            elif model_info["provider"] == "groq":
-                return self._generate_with_groq(user_input, context, model_info["model"])
-            else:
-                raise ValueError(f"Unknown provider: {model_info['provider']}")
+            cached = self._cached_command(user_input, context, model_choice)
+            if cached is not None:
+                return cached
+            key = self._response_cache_key(user_input, context, model_choice)
+            with self._lock:
+                future = self._inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._inflight[key] = Future()
+            if not leader:
+                return copy.deepcopy(future.result())
+            try:
+                # The previous leader may have stored its answer between our cache miss and taking the lead.
+                result = self._cached_command(user_input, context, model_choice)
+                if result is None:
+                    generate, model_name = self._dispatch.get(model_choice, self._dispatch["1"])
+                    result = generate(user_input, context, model_name, on_text)
+                    self._remember_command(user_input, context, model_choice, result)
+                future.set_result(copy.deepcopy(result))
+                return result
+            except Exception as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with self._lock:
+                    del self._inflight[key]
         except Exception as e:
-            self.logger.log_error(f"AI generation failed: {str(e)}")
-            return {
-                "command": None,
-                "explanation": f"Failed to generate command: {str(e)}",
-                "warning": "Please try again or use manual Git commands"
-            }
-    def _generate_with_gemini(self, user_input: str, context: Dict, model_name: str) -> Dict:
+            return self._generation_failed(e)
+    def _cached_command(self, user_input: str, context: Dict, model_choice: str) -> Optional[Dict]:
+        if not self._use_cache:
+            return None
+        cache_key = self._response_cache_key(user_input, context, model_choice)
+        cached = self._cache_get(self._response_cache, cache_key)
+        if cached is None:
+            # Near-duplicate hits are not copied into the exact tier, so they never outrank
+            # a real answer to this exact request.
+            cached = self._cache_get(self._semantic_cache, self._semantic_cache_key(user_input, context, model_choice))
+        return cached
+    def _remember_command(self, user_input: str, context: Dict, model_choice: str, result: Dict):
+        # A reply with no command is a failure worth retrying, not an answer worth replaying.
+        if not self._use_cache or not result.get("command"):
+            return
+        self._cache_put(self._response_cache, self._response_cache_key(user_input, context, model_choice), result)
+        self._cache_put(self._semantic_cache, self._semantic_cache_key(user_input, context, model_choice), result)
+    def _cache_get(self, cache: OrderedDict, key: bytes) -> Optional[Dict]:
+        with self._lock:
+            entry = cache.get(key)
+            if entry is None:
+                return None
+            expires_at, cached = entry
+            if expires_at <= time.monotonic():
+                del cache[key]
+                return None
+            cache.move_to_end(key)
+            return copy.deepcopy(cached)
+    def _cache_put(self, cache: OrderedDict, key: bytes, result: Dict):
+        entry = (time.monotonic() + _RESPONSE_CACHE_TTL, copy.deepcopy(result))
+        with self._lock:
+            cache[key] = entry
+            if len(cache) > _RESPONSE_CACHE_SIZE:
+                cache.popitem(last=False)
+    def _response_cache_key(self, user_input: str, context: Dict, model_choice: str) -> bytes:
+        get = context.get
+        context_json = _canonical_json([get(field) for field in _PROMPT_CONTEXT_FIELDS])
+        return hashlib.blake2b(
+            f"{model_choice}\0{user_input}\0".encode() + context_json, digest_size=16
+        ).digest()
+    def _semantic_cache_key(self, user_input: str, context: Dict, model_choice: str) -> bytes:
+        """Key requests that differ only in spacing, trailing punctuation or a leading "please" under a coarse context."""
+        words = " ".join(user_input.split()).rstrip(_TRAILING_PUNCTUATION)
+        # A lone trailing "." ends the sentence; two or more close a revision range ("main..").
+        if words.endswith(".") and not words.endswith(".."):
+            words = words[:-1]
+        polite = _POLITE_PREFIX_RE.match(words)
+        if polite:
+            words = words[polite.end():]
+        remote = context.get("remote_status") or {}
+        fingerprint = (
+            context.get("branch"),
+            bool(context.get("is_detached")),
+            bool(context.get("staged_files")),
+            bool(context.get("unstaged_files")),
+            bool(remote.get("ahead")),
+            bool(remote.get("behind")),
+        )
+        return hashlib.blake2b(
+            f"{model_choice}\0{words}\0{fingerprint!r}".encode(), digest_size=16
+        ).digest()
+    async def generate_command_async(self, user_input: str, context: Dict, model_choice: str = "1") -> Dict:
+        """Async variant of generate_command, for awaiting alongside other engine calls."""
+        try:
+            cached = self._cached_command(user_input, context, model_choice)
+            if cached is not None:
+                return cached
+        except Exception as e:
+            return self._generation_failed(e)
+        results = await self._agenerate_uncached([user_input], context, model_choice, 1)
+        return results[user_input]
+    def generate_commands_batch(self, user_inputs: List[str], context: Dict, model_choice: str = "1",
+                                max_concurrency: int = 8) -> List[Dict]:
+        """Generate commands for several requests concurrently, returned in input order.
+
+        Repeated requests are sent once, and ones already in the response cache are not sent at all.
+        """
+        return asyncio.run(self._agenerate_commands_batch(user_inputs, context, model_choice, max_concurrency))
+    async def _agenerate_commands_batch(self, user_inputs: List[str], context: Dict, model_choice: str,
+                                        max_concurrency: int) -> List[Dict]:
+        results = {}
+        for user_input in dict.fromkeys(user_inputs):
+            results[user_input] = self._cached_command(user_input, context, model_choice)
+        pending = [user_input for user_input, result in results.items() if result is None]
+        if pending:
+            results.update(await self._agenerate_uncached(pending, context, model_choice, max_concurrency))
+        return [copy.deepcopy(results[user_input]) for user_input in user_inputs]
+    async def _agenerate_uncached(self, user_inputs: List[str], context: Dict, model_choice: str,
+                                  max_concurrency: int) -> Dict[str, Dict]:
+        provider, model_name = _MODEL_ROUTES.get(model_choice, _DEFAULT_ROUTE)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        groq_client = None
+        if provider == "groq":
+            try:
+                groq_client = _async_groq_client(self._groq_api_key)
+            except Exception as e:
+                failure = self._generation_failed(e)
+                return {user_input: copy.deepcopy(failure) for user_input in user_inputs}
+        async def generate(user_input: str) -> Dict:
+            async with semaphore:
+                try:
+                    if groq_client is None:
+                        result = await self._agenerate_with_gemini(user_input, context, model_name)
+                    else:
+                        result = await self._agenerate_with_groq(groq_client, user_input, context, model_name)
+                except Exception as e:
+                    return self._generation_failed(e)
+                self._remember_command(user_input, context, model_choice, result)
+                return result
+        try:
+            return dict(zip(user_inputs, await asyncio.gather(*(generate(user_input) for user_input in user_inputs))))
+        finally:
+            if groq_client is not None:
+                await groq_client.close()
+    def _generation_failed(self, error: Exception) -> Dict:
+        self.logger.log_error("AI generation failed: {}", error)
+        return {
+            "command": None,
+            "explanation": f"Failed to generate command: {str(error)}",
+            "warning": "Please try again or use manual Git commands"
+        }
+    def _generate_with_gemini(self, user_input: str, context: Dict, model_name: str,
+                              on_text: Optional[Callable[[str], None]] = None) -> Dict:
         prompt = self._build_prompt(user_input, context)
-        model = genai.GenerativeModel(model_name)
-        response = model.generate_content(prompt)
-        response_text = response.text if hasattr(response, 'text') else str(response)
+        response_text = self._stream_reply(
+            "gemini", model_name, _COMMAND_SYSTEM_MESSAGE, prompt, 1000, self._is_command_reply, on_text
+        )
         self.logger.log_ai_query(user_input, response_text, "gemini")
         return self._parse_ai_response(response_text)
-    def _generate_with_groq(self, user_input: str, context: Dict, model_name: str) -> Dict:
+    async def _agenerate_with_gemini(self, user_input: str, context: Dict, model_name: str) -> Dict:
         prompt = self._build_prompt(user_input, context)
-        response = self.groq_client.chat.completions.create(
-            model=model_name,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are GitPilot, an AI assistant that converts natural language to Git commands. CRITICAL: Always respond with ONLY a valid JSON object in this exact format: {\"command\": \"git ...\", \"explanation\": \"...\", \"warning\": \"...\" or null}. The command should be a valid Git command or null if no command can be generated. Do not include any text before or after the JSON object."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.1,
-            max_tokens=1000
+        response_text = await self._areply("gemini", model_name, _COMMAND_SYSTEM_MESSAGE, prompt, 1000, self._is_command_reply)
+        self.logger.log_ai_query(user_input, response_text, "gemini")
+        return self._parse_ai_response(response_text)
+    def _get_gemini_model(self, model_name: str) -> "genai.GenerativeModel":
+        model = self._gemini_models.get(model_name)
+        if model is None:
+            model = self._gemini_models[model_name] = self.gemini_client.GenerativeModel(model_name)
+        return model
+    def _generate_with_groq(self, user_input: str, context: Dict, model_name: str,
+                            on_text: Optional[Callable[[str], None]] = None) -> Dict:
+        prompt = self._build_prompt(user_input, context)
+        response_text = self._stream_reply(
+            "groq", model_name, _COMMAND_SYSTEM_MESSAGE, prompt, 1000, self._is_command_reply, on_text
         )
-        response_text = response.choices[0].message.content or ""
         self.logger.log_ai_query(user_input, response_text, f"groq-{model_name}")
         return self._parse_ai_response(response_text)
-    def _build_prompt(self, user_input: str, context: Dict) -> str:
-        context_str = self._format_context(context)
-        return CONTEXT_PROMPT.format(
-            branch=context.get("branch", "unknown"),
-            is_dirty=context.get("is_dirty", False),
-            staged_files=context.get("staged_files", 0),
-            unstaged_files=context.get("unstaged_files", 0),
-            is_detached=context.get("is_detached", False),
-            remote_status=context.get("remote_status", {}),
-            user_input=user_input
+    async def _agenerate_with_groq(self, groq_client, user_input: str, context: Dict, model_name: str) -> Dict:
+        prompt = self._build_prompt(user_input, context)
+        response_text = await self._areply(
+            "groq", model_name, _COMMAND_SYSTEM_MESSAGE, prompt, 1000, self._is_command_reply, groq_client
         )
+        self.logger.log_ai_query(user_input, response_text, f"groq-{model_name}")
+        return self._parse_ai_response(response_text)
+    def _stream_reply(self, provider: str, model_name: str, system_message: Dict, prompt: str, max_tokens: int,
+                      usable: Callable[[str], bool], on_text: Optional[Callable[[str], None]] = None) -> str:
+        """Return the model's reply to prompt; only replies usable() accepts are cached on disk."""
+        key, cached = self._cached_reply(model_name, system_message, prompt)
+        if cached is not None:
+            return cached
+        bucket = self._rate_limits[provider]
+        attempt = 0
+        while True:
+            bucket.acquire()
+            try:
+                response_text = self._fetch_stream(provider, model_name, system_message, prompt, max_tokens, on_text)
+                break
+            except Exception as e:
+                if attempt >= _RATE_LIMIT_RETRIES or not _is_rate_limited(e):
+                    raise
+            time.sleep(_RATE_LIMIT_BACKOFF * 2 ** attempt)
+            attempt += 1
+        if usable(response_text):
+            self._remember_reply(key, model_name, response_text)
+        return response_text
+    def _fetch_stream(self, provider: str, model_name: str, system_message: Dict, prompt: str,
+                      max_tokens: int, on_text: Optional[Callable[[str], None]] = None) -> str:
+        if provider == "gemini":
+            response = self._get_gemini_model(model_name).generate_content(prompt, stream=True)
+            return self._collect_stream(map(_gemini_text, response), on_text)
+        stream = self.groq_client.chat.completions.create(
+            model=model_name,
+            messages=[system_message, {"role": "user", "content": prompt}],
+            temperature=0.1,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        try:
+            return self._collect_stream(
+                (chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices), on_text
+            )
+        finally:
+            stream.close()
+    async def _areply(self, provider: str, model_name: str, system_message: Dict, prompt: str, max_tokens: int,
+                      usable: Callable[[str], bool], groq_client=None) -> str:
+        """Async variant of _stream_reply, without streaming."""
+        key, cached = self._cached_reply(model_name, system_message, prompt)
+        if cached is not None:
+            return cached
+        bucket = self._rate_limits[provider]
+        attempt = 0
+        while True:
+            await bucket.acquire_async()
+            try:
+                response_text = await self._afetch(provider, model_name, system_message, prompt, max_tokens, groq_client)
+                break
+            except Exception as e:
+                if attempt >= _RATE_LIMIT_RETRIES or not _is_rate_limited(e):
+                    raise
+            await asyncio.sleep(_RATE_LIMIT_BACKOFF * 2 ** attempt)
+            attempt += 1
+        if usable(response_text):
+            self._remember_reply(key, model_name, response_text)
+        return response_text
+    async def _afetch(self, provider: str, model_name: str, system_message: Dict, prompt: str,
+                      max_tokens: int, groq_client=None) -> str:
+        if provider == "gemini":
+            response = await self._get_gemini_model(model_name).generate_content_async(prompt)
+            return _gemini_text(response)
+        messages = [system_message, {"role": "user", "content": prompt}]
+        if groq_client is None:
+            async with _async_groq_client(self._groq_api_key) as groq_client:
+                response = await groq_client.chat.completions.create(
+                    model=model_name, messages=messages, temperature=0.1, max_tokens=max_tokens
+                )
+        else:
+            response = await groq_client.chat.completions.create(
+                model=model_name, messages=messages, temperature=0.1, max_tokens=max_tokens
+            )
+        return response.choices[0].message.content or ""
+    def _cached_reply(self, model_name: str, system_message: Dict, prompt: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """Look a raw reply up in the on-disk cache, returning its key for storing a fresh one."""
+        cache = self._reply_cache
+        if cache is None:
+            return None, None
+        key = LLMCache.make_key(model_name, system_message["content"], prompt)
+        try:
+            cached = cache.get(key)
+        except sqlite3.Error as e:
+            self.logger.log_warning("Response cache read failed: {}", e)
+            return key, None
+        if cached is not None:
+            self.logger.log_info("Response cache hit [{}]", model_name)
+        return key, cached
+    def _remember_reply(self, key: Optional[bytes], model_name: str, response_text: str):
+        if key is None or not response_text:
+            return
+        try:
+            self._reply_cache.put(key, model_name, response_text)
+        except sqlite3.Error as e:
+            self.logger.log_warning("Response cache write failed: {}", e)
+    def _collect_stream(self, fragments: Iterable[str], on_text: Optional[Callable[[str], None]] = None) -> str:
+        """Join streamed response text, stopping as soon as a leading JSON object closes."""
+        parts = []
+        is_json = None
+        depth = 0
+        in_string = escaped = False
+        for fragment in fragments:
+            if on_text is not None:
+                on_text(fragment)
+            if is_json is not False:
+                for i, char in enumerate(fragment):
+                    if is_json is None:
+                        if char.isspace():
+                            continue
+                        is_json = char == "{"
+                        if not is_json:
+                            break
+                    if in_string:
+                        if escaped:
+                            escaped = False
+                        elif char == "\\":
+                            escaped = True
+                        elif char == '"':
+                            in_string = False
+                    elif char == '"':
+                        in_string = True
+                    elif char == "{":
+                        depth += 1
+                    elif char == "}":
+                        depth -= 1
+                        if depth == 0:
+                            parts.append(fragment[:i + 1])
+                            return "".join(parts)
+            parts.append(fragment)
+        return "".join(parts)
+    def _build_prompt(self, user_input: str, context: Dict) -> str:
+        get = context.get
+        pieces = []
+        for literal, field, default in _CONTEXT_PROMPT_PARTS:
+            pieces.append(literal)
+            if field == "user_input":
+                pieces.append(user_input)
+            elif field is not None:
+                pieces.append(str(get(field, default)))
+        return "".join(pieces)
     def _format_context(self, context: Dict) -> str:
         if "error" in context:
             return f"Error: {context['error']}"
@@ -87,81 +582,181 @@ class AIEngine:
             f"Unstaged files: {context.get('unstaged_files', 0)}",
             f"Untracked files: {context.get('untracked_files', 0)}",
         ]
-        if context.get("remote_status", {}).get("has_remote"):
-            remote = context["remote_status"]
+        remote = context.get("remote_status") or {}
+        if remote.get("has_remote"):
             lines.append(f"Remote: {remote.get('ahead', 0)} ahead, {remote.get('behind', 0)} behind")
         return "\n".join(lines)
     def _parse_ai_response(self, response: str) -> Dict:
-        import re
         try:
-            response_clean = response.strip()
-            json_match = re.search(r'{[^}]*"command"[^}]*}', response_clean, re.DOTALL)
-            if json_match:
+            # Replies are asked to be a bare JSON object, so try that before searching.
+            if _LEADING_BRACE_RE.match(response):
                 try:
-                    return json.loads(json_match.group())
+                    return json_loads(response)
                 except json.JSONDecodeError:
                     pass
-            if response_clean.startswith("{"):
+            command_object = self._find_command_object(response)
+            if command_object is not None:
                 try:
-                    return json.loads(response_clean)
+                    return json_loads(command_object)
                 except json.JSONDecodeError:
                     pass
-            lines = response_clean.split("\n")
             command = None
-            explanation = ""
+            explanation_text = response
+            command_match = _COMMAND_RE.search(response)
+            if command_match:
+                command = next(group for group in command_match.groups() if group is not None)
+                explanation_text = response[:command_match.start()]
             warning = None
-            for line in lines:
+            mention = None
+            for warning_match in _WARNING_RE.finditer(response):
+                prefixed = warning_match.group("prefixed")
+                if prefixed is not None:
+                    warning = prefixed.strip()
+                elif warning is None:
+                    # A mention ahead of every prefixed line is kept out of the explanation.
+                    mention = warning = warning_match.group("mention").strip()
+            explanation_parts = []
+            for line in explanation_text.split("\n"):
                 line = line.strip()
-                if not command:
-                    if line.startswith("git "):
-                        command = line
-                    elif "`git " in line:
-                        git_match = re.search(r'`(git [^`]+)`', line)
-                        if git_match:
-                            command = git_match.group(1)
-                    elif line.startswith("```") and "git " in line:
-                        git_match = re.search(r'git [^\n]+', line)
-                        if git_match:
-                            command = git_match.group()
-                    elif ":" in line and "git " in line:
-                        git_match = re.search(r'git [^\n]+', line)
-                        if git_match:
-                            command = git_match.group()
-                if line.startswith(("Warning:", "Note:", "⚠️", "WARNING:")):
-                    warning = line
-                elif "warning" in line.lower() and not warning:
-                    warning = line
-                elif line and not command and not line.startswith(("```", "`", "Warning:", "Note:")):
+                if line == mention:
+                    # Only the line reported as the warning is left out; later copies of it stay.
+                    mention = None
+                    continue
+                if line and not line.startswith(_NON_EXPLANATION_PREFIXES):
                     if "git " not in line:
-                        explanation += line + " "
+                        explanation_parts.append(line)
             if command:
                 command = command.strip().strip('`').strip()
                 if not command.startswith("git "):
                     command = "git " + command
             return {
                 "command": command,
-                "explanation": explanation.strip(),
+                "explanation": " ".join(explanation_parts),
                 "warning": warning
             }
         except Exception as e:
-            self.logger.log_error(f"Error parsing AI response: {str(e)}")
-            self.logger.log_error(f"Raw response: {response[:200]}...")
+            self.logger.log_error("Error parsing AI response: {}", e)
+            self.logger.log_error("Raw response: {:.200}...", response)
             return {
                 "command": None,
                 "explanation": response,
                 "warning": "Failed to parse AI response"
             }
+    def _is_command_reply(self, response: str) -> bool:
+        return bool(self._parse_ai_response(response).get("command"))
+    def _find_command_object(self, response: str) -> Optional[str]:
+        """Return the first "{...}" span, with no "}" inside it, that mentions "command"."""
+        start = response.find("{")
+        while start != -1:
+            end = response.find("}", start)
+            if end == -1:
+                return None
+            if response.find('"command"', start, end) != -1:
+                return response[start:end + 1]
+            # Any later "{" before this "}" sees a shorter window, so skip past it.
+            start = response.find("{", end)
+        return None
 
     def resolve_merge_conflict(self, conflict_content: str, context: Dict, model_choice: str = "1") -> Dict:
         """AI-powered merge conflict resolution."""
         try:
-            prompt = f"""
+            prompt = self._conflict_prompt(conflict_content, context)
+            provider, model_name = _MODEL_ROUTES.get(model_choice, _DEFAULT_ROUTE)
+            response_text = self._stream_reply(provider, model_name, _CONFLICT_SYSTEM_MESSAGE, prompt, 1500, self._is_json_reply)
+            self.logger.log_ai_query(f"Conflict resolution for {len(conflict_content)} chars", response_text, f"{provider}-conflict")
+            return self._parse_conflict_response(response_text)
+        except Exception as e:
+            return self._conflict_failed(e)
+
+    async def resolve_merge_conflict_async(self, conflict_content: str, context: Dict, model_choice: str = "1") -> Dict:
+        """Async variant of resolve_merge_conflict."""
+        try:
+            prompt = self._conflict_prompt(conflict_content, context)
+            provider, model_name = _MODEL_ROUTES.get(model_choice, _DEFAULT_ROUTE)
+            response_text = await self._areply(provider, model_name, _CONFLICT_SYSTEM_MESSAGE, prompt, 1500, self._is_json_reply)
+            self.logger.log_ai_query(f"Conflict resolution for {len(conflict_content)} chars", response_text, f"{provider}-conflict")
+            return self._parse_conflict_response(response_text)
+        except Exception as e:
+            return self._conflict_failed(e)
+
+    def semantic_commit_search(self, search_query: str, commit_history: List[str], model_choice: str = "1") -> Dict:
+        """Search commits using natural language."""
+        try:
+            provider, model_name = _MODEL_ROUTES.get(model_choice, _DEFAULT_ROUTE)
+            def search_chunk(chunk: List[str]):
+                try:
+                    prompt = self._search_prompt(search_query, chunk)
+                    response_text = self._stream_reply(provider, model_name, _SEARCH_SYSTEM_MESSAGE, prompt, 1000, self._is_json_reply)
+                    self.logger.log_ai_query(search_query, response_text, f"{provider}-search")
+                    return self._parse_search_response(response_text)
+                except Exception as e:
+                    return e
+            chunks = self._search_chunks(commit_history)
+            if len(chunks) == 1:
+                return self._merge_search_results([search_chunk(chunks[0])])
+            with ThreadPoolExecutor(max_workers=min(len(chunks), _SEARCH_CONCURRENCY)) as pool:
+                return self._merge_search_results(list(pool.map(search_chunk, chunks)))
+        except Exception as e:
+            return self._search_failed(e)
+
+    async def semantic_commit_search_async(self, search_query: str, commit_history: List[str], model_choice: str = "1") -> Dict:
+        """Async variant of semantic_commit_search."""
+        try:
+            provider, model_name = _MODEL_ROUTES.get(model_choice, _DEFAULT_ROUTE)
+            semaphore = asyncio.Semaphore(_SEARCH_CONCURRENCY)
+            # Every chunk goes through one client so they share its warm connections.
+            groq_client = _async_groq_client(self._groq_api_key) if provider == "groq" else None
+            async def search_chunk(chunk: List[str]):
+                try:
+                    prompt = self._search_prompt(search_query, chunk)
+                    async with semaphore:
+                        response_text = await self._areply(
+                            provider, model_name, _SEARCH_SYSTEM_MESSAGE, prompt, 1000, self._is_json_reply, groq_client
+                        )
+                    self.logger.log_ai_query(search_query, response_text, f"{provider}-search")
+                    return self._parse_search_response(response_text)
+                except Exception as e:
+                    return e
+            chunks = self._search_chunks(commit_history)
+            try:
+                results = await asyncio.gather(*(search_chunk(chunk) for chunk in chunks))
+            finally:
+                if groq_client is not None:
+                    await groq_client.close()
+            return self._merge_search_results(results)
+        except Exception as e:
+            return self._search_failed(e)
+
+    def analyze_repository_health(self, repo_stats: Dict, model_choice: str = "1") -> Dict:
+        """AI-powered repository health analysis."""
+        try:
+            prompt = self._health_prompt(repo_stats)
+            provider, model_name = _MODEL_ROUTES.get(model_choice, _DEFAULT_ROUTE)
+            response_text = self._stream_reply(provider, model_name, _HEALTH_SYSTEM_MESSAGE, prompt, 1200, self._is_json_reply)
+            self.logger.log_ai_query("Repository health analysis", response_text, f"{provider}-health")
+            return self._parse_health_response(response_text)
+        except Exception as e:
+            return self._health_failed(e)
+
+    async def analyze_repository_health_async(self, repo_stats: Dict, model_choice: str = "1") -> Dict:
+        """Async variant of analyze_repository_health."""
+        try:
+            prompt = self._health_prompt(repo_stats)
+            provider, model_name = _MODEL_ROUTES.get(model_choice, _DEFAULT_ROUTE)
+            response_text = await self._areply(provider, model_name, _HEALTH_SYSTEM_MESSAGE, prompt, 1200, self._is_json_reply)
+            self.logger.log_ai_query("Repository health analysis", response_text, f"{provider}-health")
+            return self._parse_health_response(response_text)
+        except Exception as e:
+            return self._health_failed(e)
+
+    def _conflict_prompt(self, conflict_content: str, context: Dict) -> str:
+        return f"""
 You are GitPilot, an expert Git assistant. A merge conflict has occurred. 
 Analyze the conflict and provide a resolution strategy.
 
 Conflict content:
 ```
-{conflict_content[:2000]}  # Limit content size
+{conflict_content[:CONFLICT_EXCERPT_CHARS]}
 ```
 
 Repository context:
@@ -175,39 +770,43 @@ Provide a JSON response with:
     "auto_resolvable": true/false
 }}
 """
-            model_info = self.available_models.get(model_choice, self.available_models["1"])
-            if model_info["provider"] == "gemini":
-                model = genai.GenerativeModel(model_info["model"])
-                response = model.generate_content(prompt)
-                response_text = response.text if hasattr(response, 'text') else str(response)
-            else:
-                response = self.groq_client.chat.completions.create(
-                    model=model_info["model"],
-                    messages=[
-                        {"role": "system", "content": "You are GitPilot, an expert Git merge conflict resolver. Always respond with valid JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.1,
-                    max_tokens=1500
-                )
-                response_text = response.choices[0].message.content or ""
-            
-            self.logger.log_ai_query(f"Conflict resolution for {len(conflict_content)} chars", response_text, f"{model_info['provider']}-conflict")
-            return self._parse_conflict_response(response_text)
-        except Exception as e:
-            self.logger.log_error(f"Conflict resolution failed: {str(e)}")
-            return {
-                "resolution_strategy": "Manual resolution required",
-                "recommended_commands": ["git status", "git add <resolved-files>", "git commit"],
-                "explanation": f"AI resolution failed: {str(e)}. Please resolve manually.",
-                "auto_resolvable": False
-            }
 
-    def semantic_commit_search(self, search_query: str, commit_history: List[str], model_choice: str = "1") -> Dict:
-        """Search commits using natural language."""
-        try:
-            commits_text = "\n".join(commit_history[:50])  # Limit to recent commits
-            prompt = f"""
+    def _conflict_failed(self, e: Exception) -> Dict:
+        self.logger.log_error("Conflict resolution failed: {}", e)
+        return {
+            "resolution_strategy": "Manual resolution required",
+            "recommended_commands": ["git status", "git add <resolved-files>", "git commit"],
+            "explanation": f"AI resolution failed: {str(e)}. Please resolve manually.",
+            "auto_resolvable": False
+        }
+
+    def _search_chunks(self, commit_history: List[str]) -> List[List[str]]:
+        commit_history = commit_history[:_SEARCH_MAX_COMMITS]
+        chunks = [commit_history[i:i + _SEARCH_CHUNK_SIZE] for i in range(0, len(commit_history), _SEARCH_CHUNK_SIZE)]
+        return chunks or [commit_history]
+
+    def _merge_search_results(self, results: List) -> Dict:
+        """Combine per-chunk search results, best matches first; failed chunks are passed as their exception."""
+        searched = [result for result in results if not isinstance(result, Exception)]
+        if not searched:
+            return self._search_failed(results[0])
+        if len(results) == 1:
+            return searched[0]
+        chunk_matches = [[match for match in result.get("matches") or () if isinstance(match, dict)] for result in searched]
+        matches = sorted((match for chunk in chunk_matches for match in chunk), key=_relevance, reverse=True)
+        # The chunk holding the best match speaks for the whole search.
+        best = max(range(len(searched)), key=lambda i: max(map(_relevance, chunk_matches[i]), default=-1.0))
+        summary = searched[best].get("summary") or "No matches found"
+        failed = len(results) - len(searched)
+        if failed:
+            self.logger.log_warning("Commit search failed for {} of {} chunks: {}", failed, len(results),
+                                    next(result for result in results if isinstance(result, Exception)))
+            summary = f"{summary} ({failed} of {len(results)} batches of commits could not be searched.)"
+        return {"matches": matches, "summary": summary}
+
+    def _search_prompt(self, search_query: str, commit_history: List[str]) -> str:
+        commits_text = "\n".join(commit_history)
+        return f"""
 You are GitPilot. Search through the commit history using natural language.
 
 Search query: "{search_query}"
@@ -230,40 +829,20 @@ Find commits that match the search intent. Provide a JSON response:
     "summary": "brief summary of search results"
 }}
 """
-            model_info = self.available_models.get(model_choice, self.available_models["1"])
-            if model_info["provider"] == "gemini":
-                model = genai.GenerativeModel(model_info["model"])
-                response = model.generate_content(prompt)
-                response_text = response.text if hasattr(response, 'text') else str(response)
-            else:
-                response = self.groq_client.chat.completions.create(
-                    model=model_info["model"],
-                    messages=[
-                        {"role": "system", "content": "You are GitPilot, a semantic commit search assistant. Always respond with valid JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.1,
-                    max_tokens=1000
-                )
-                response_text = response.choices[0].message.content or ""
-            
-            self.logger.log_ai_query(search_query, response_text, f"{model_info['provider']}-search")
-            return self._parse_search_response(response_text)
-        except Exception as e:
-            self.logger.log_error(f"Semantic search failed: {str(e)}")
-            return {
-                "matches": [],
-                "summary": f"Search failed: {str(e)}"
-            }
 
-    def analyze_repository_health(self, repo_stats: Dict, model_choice: str = "1") -> Dict:
-        """AI-powered repository health analysis."""
-        try:
-            prompt = f"""
+    def _search_failed(self, e: Exception) -> Dict:
+        self.logger.log_error("Semantic search failed: {}", e)
+        return {
+            "matches": [],
+            "summary": f"Search failed: {str(e)}"
+        }
+
+    def _health_prompt(self, repo_stats: Dict) -> str:
+        return f"""
 You are GitPilot, a repository health expert. Analyze the repository statistics and provide health recommendations.
 
 Repository statistics:
-{json.dumps(repo_stats, indent=2)}
+{_indented_json(repo_stats)}
 
 Provide a JSON response:
 {{
@@ -281,92 +860,96 @@ Provide a JSON response:
     "summary": "brief health summary"
 }}
 """
-            model_info = self.available_models.get(model_choice, self.available_models["1"])
-            if model_info["provider"] == "gemini":
-                model = genai.GenerativeModel(model_info["model"])
-                response = model.generate_content(prompt)
-                response_text = response.text if hasattr(response, 'text') else str(response)
-            else:
-                response = self.groq_client.chat.completions.create(
-                    model=model_info["model"],
-                    messages=[
-                        {"role": "system", "content": "You are GitPilot, a repository health analyst. Always respond with valid JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.1,
-                    max_tokens=1200
-                )
-                response_text = response.choices[0].message.content or ""
-            
-            self.logger.log_ai_query("Repository health analysis", response_text, f"{model_info['provider']}-health")
-            return self._parse_health_response(response_text)
-        except Exception as e:
-            self.logger.log_error(f"Health analysis failed: {str(e)}")
-            return {
-                "overall_health": "unknown",
-                "health_score": 0,
-                "issues": [],
-                "recommendations": [],
-                "summary": f"Analysis failed: {str(e)}"
-            }
 
-    def _parse_conflict_response(self, response: str) -> Dict:
-        """Parse conflict resolution response."""
+    def _health_failed(self, e: Exception) -> Dict:
+        self.logger.log_error("Health analysis failed: {}", e)
+        return {
+            "overall_health": "unknown",
+            "health_score": 0,
+            "issues": [],
+            "recommendations": [],
+            "summary": f"Analysis failed: {str(e)}"
+        }
+
+    def _extract_first_json(self, text: str) -> Optional[str]:
+        """Return the first balanced "{...}" in text, ignoring braces inside JSON strings."""
+        start = text.find("{")
+        if start == -1:
+            return None
+        depth = 0
+        in_string = False
+        escaped_at = -1
+        for match in _JSON_TOKEN_RE.finditer(text, start):
+            i = match.start()
+            if i == escaped_at:
+                continue
+            char = match.group()
+            if in_string:
+                if char == "\\":
+                    escaped_at = i + 1
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[start:i + 1]
+        return None
+
+    def _parse_json_response(self, response: str, default: Dict, failure: Optional[Dict] = None) -> Dict:
+        """Parse the JSON object in a secondary reply, or return default if there is none."""
         try:
-            import re
-            json_match = re.search(r'{.*}', response, re.DOTALL)
+            json_text = self._extract_first_json(response)
+            if json_text is not None:
+                try:
+                    return json_loads(json_text)
+                except json.JSONDecodeError:
+                    pass
+            json_match = _JSON_SPAN_RE.search(response)
             if json_match:
-                return json.loads(json_match.group())
-            return {
-                "resolution_strategy": response,
-                "recommended_commands": [],
-                "explanation": "Manual parsing of AI response",
-                "auto_resolvable": False
-            }
+                return json_loads(json_match.group())
+            return default
         except:
-            return {
-                "resolution_strategy": "Manual resolution required",
-                "recommended_commands": [],
-                "explanation": "Failed to parse conflict resolution",
-                "auto_resolvable": False
-            }
+            return default if failure is None else failure
+
+    def _is_json_reply(self, response: str) -> bool:
+        """Whether _parse_json_response finds an object in response rather than falling back."""
+        fallback = {}
+        return self._parse_json_response(response, fallback) is not fallback
+
+    def _parse_conflict_response(self, response: str) -> Dict:
+        """Parse conflict resolution response."""
+        return self._parse_json_response(response, {
+            "resolution_strategy": response,
+            "recommended_commands": [],
+            "explanation": "Manual parsing of AI response",
+            "auto_resolvable": False
+        }, {
+            "resolution_strategy": "Manual resolution required",
+            "recommended_commands": [],
+            "explanation": "Failed to parse conflict resolution",
+            "auto_resolvable": False
+        })
 
     def _parse_search_response(self, response: str) -> Dict:
         """Parse semantic search response."""
-        try:
-            import re
-            json_match = re.search(r'{.*}', response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            return {
-                "matches": [],
-                "summary": "No matches found"
-            }
-        except:
-            return {
-                "matches": [],
-                "summary": "Failed to parse search results"
-            }
+        return self._parse_json_response(response, {
+            "matches": [],
+            "summary": "No matches found"
+        }, {
+            "matches": [],
+            "summary": "Failed to parse search results"
+        })
 
     def _parse_health_response(self, response: str) -> Dict:
         """Parse health analysis response."""
-        try:
-            import re
-            json_match = re.search(r'{.*}', response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            return {
-                "overall_health": "unknown",
-                "health_score": 0,
-                "issues": [],
-                "recommendations": [],
-                "summary": "Failed to parse health analysis"
-            }
-        except:
-            return {
-                "overall_health": "unknown",
-                "health_score": 0,
-                "issues": [],
-                "recommendations": [],
-                "summary": "Failed to parse health analysis"
-            }
+        return self._parse_json_response(response, {
+            "overall_health": "unknown",
+            "health_score": 0,
+            "issues": [],
+            "recommendations": [],
+            "summary": "Failed to parse health analysis"
+        })
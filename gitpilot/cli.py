@@ -1,48 +1,112 @@
+import copy
 import os
 import sys
 import json
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 import click
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
 from rich.table import Table
 from rich.text import Text
-from rich.tree import Tree
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.markup import escape
 
-from .ai_engine import AIEngine
-from .context_analyzer import ContextAnalyzer
-from .git_executor import GitExecutor
 from .logger import GitPilotLogger
-from .repo_health import RepositoryHealthMonitor
+from .models import AVAILABLE_MODELS
+
+# The engine, GitPython, the health monitor and the single-use rich widgets load only
+# in the commands that use them, so --help and --history start without them.
+if TYPE_CHECKING:
+    from .ai_engine import AIEngine
 
 console = Console()
 
+# click rejects unknown --model values while parsing, before any command runs.
+_MODEL_CHOICE = click.Choice(list(AVAILABLE_MODELS))
+
+_CONFIG_PATH = os.path.expanduser("~/.gitpilot/config.yaml")
+_DEFAULT_CONFIG = {
+    "auto_confirm": False,
+    "explain_by_default": False,
+    "log_level": "INFO",
+    "default_model": "1",
+    "groq_rpm": 30,
+    "gemini_rpm": 60
+}
+# Provider cell of the model table for every provider AIEngine routes to.
+_PROVIDER_DISPLAY = {"gemini": "🔸 Gemini", "groq": "⚡ Groq"}
+# One-word requests that need no model to translate. Only read-only commands: anything
+# that changes the work tree needs the model's context-aware warning.
+_TRIVIAL_QUERIES = {
+    "status": "git status",
+    "log": "git log --oneline -20",
+    "diff": "git diff",
+    "fetch": "git fetch",
+    "branch": "git branch",
+    "branches": "git branch -a",
+}
+# Search relevance bars for 0..10 filled cells.
+_RELEVANCE_BARS = tuple("█" * filled + "░" * (10 - filled) for filled in range(11))
+# The last parsed config and the (mtime, size) of the file it came from.
+_config_cache = None
+
 def load_config():
     """Load configuration from config file"""
-    config_path = os.path.expanduser("~/.gitpilot/config.yaml")
-    default_config = {
-        "auto_confirm": False,
-        "explain_by_default": False,
-        "log_level": "INFO",
-        "default_model": "1"  
-    }
+    global _config_cache
+    try:
+        stat = os.stat(_CONFIG_PATH)
+    except OSError:
+        return dict(_DEFAULT_CONFIG)
+    file_key = [stat.st_mtime_ns, stat.st_size]
+    if _config_cache is None or _config_cache[0] != file_key:
+        _config_cache = (file_key, _read_config(file_key))
+    return copy.deepcopy(_config_cache[1])
+
+def _read_config(file_key: List[int]) -> Dict:
+    # The parsed YAML is kept in a JSON sidecar keyed by the file's mtime and size,
+    # so unchanged configs are read without importing yaml at all.
+    cache_path = os.path.join(os.path.dirname(_CONFIG_PATH), ".config.cache.json")
+    try:
+        with open(cache_path, 'r') as f:
+            cached = json.load(f)
+        if cached["key"] == file_key:
+            return _with_defaults(cached["config"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
     try:
         import yaml
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-                return {**default_config, **config}
+        with open(_CONFIG_PATH, 'r') as f:
+            # libyaml's C loader when PyYAML was built with it; same safe subset either way.
+            config = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
     except ImportError:
+        return dict(_DEFAULT_CONFIG)
+    try:
+        with open(cache_path, 'w') as f:
+            json.dump({"key": file_key, "config": config}, f)
+    except (OSError, TypeError, ValueError):
         pass
-    return default_config
+    return _with_defaults(config)
+
+def _with_defaults(config: Optional[Dict]) -> Dict:
+    merged = _DEFAULT_CONFIG.copy()
+    merged.update(config or {})
+    return merged
+
+def create_ai_engine(config: Optional[Dict] = None) -> "AIEngine":
+    """Create the AI engine, honouring the top-level --no-cache flag and configured rate limits"""
+    from .ai_engine import AIEngine
+    config = config or load_config()
+    options = click.get_current_context().find_object(dict) or {}
+    try:
+        return AIEngine(
+            use_cache=options.get("use_cache", True),
+            requests_per_minute={"groq": config["groq_rpm"], "gemini": config["gemini_rpm"]}
+        )
+    except ValueError as e:
+        raise click.ClickException(f"Invalid groq_rpm/gemini_rpm in ~/.gitpilot/config.yaml: {e}")
 
-def display_model_selection(ai_engine: AIEngine) -> str:
+def display_model_selection(models: Dict) -> str:
     """Display available models and get user selection"""
-    models = ai_engine.get_available_models()
     
     table = Table(title="🤖 Available AI Models", show_header=True, header_style="bold magenta")
     table.add_column("Choice", style="cyan", width=8)
@@ -50,26 +114,28 @@ def display_model_selection(ai_engine: AIEngine) -> str:
     table.add_column("Provider", style="blue")
     
     for choice, model_info in models.items():
-        provider_emoji = "🔸" if model_info["provider"] == "gemini" else "⚡"
+        provider = model_info["provider"]
         table.add_row(
             choice, 
             model_info["name"], 
-            f"{provider_emoji} {model_info['provider'].title()}"
+            _PROVIDER_DISPLAY.get(provider) or f"⚡ {provider.title()}"
         )
     
     console.print(table)
     
-    while True:
-        choice = Prompt.ask(
-            "Select a model", 
-            choices=list(models.keys()), 
-            default="1"
-        )
-        if choice in models:
-            selected_model = models[choice]
-            console.print(f"✅ Selected: {selected_model['name']}", style="green")
-            return choice
-        console.print("❌ Invalid choice. Please try again.", style="red")
+    from rich.prompt import Prompt
+    # Prompt.ask re-prompts by itself until the answer is one of the choices.
+    choice = Prompt.ask("Select a model", choices=list(models), default="1")
+    console.print(f"✅ Selected: {models[choice]['name']}", style="green", markup=False)
+    return choice
+
+def _show_version(ctx: click.Context, param: click.Parameter, value: bool):
+    """Print the version and exit while click is still parsing, before main or any subcommand runs."""
+    if not value or ctx.resilient_parsing:
+        return
+    from . import __version__
+    click.echo(f"GitPilot version {__version__}")
+    ctx.exit()
 
 @click.group(invoke_without_command=True)
 @click.argument('query', required=False)
@@ -77,64 +143,85 @@ def display_model_selection(ai_engine: AIEngine) -> str:
 @click.option('--explain', '-e', is_flag=True, help='Show detailed explanation')
 @click.option('--yes', '-y', is_flag=True, help='Auto-confirm destructive operations')
 @click.option('--history', '-h', is_flag=True, help='Show recent command history')
-@click.option('--version', is_flag=True, help='Show version information')
-@click.option('--model', '-m', type=str, help='Select AI model (1-4)')
+@click.option('--version', is_flag=True, expose_value=False, is_eager=True, callback=_show_version,
+              help='Show version information')
+@click.option('--model', '-m', type=_MODEL_CHOICE, help='Select AI model (1-4)')
 @click.option('--skip-model-selection', is_flag=True, help='Skip model selection and use default')
+@click.option('--no-cache', is_flag=True, help='Always ask the AI model instead of reusing cached replies')
+@click.option('--refresh-remote', is_flag=True, help='Fetch from origin before comparing your branch with it')
 @click.pass_context
 def main(ctx: click.Context, query: Optional[str], dry_run: bool, explain: bool, yes: bool, history: bool, 
-         version: bool, model: Optional[str], skip_model_selection: bool):
+         model: Optional[str], skip_model_selection: bool, no_cache: bool, refresh_remote: bool):
     """GitPilot - AI-powered Git assistant"""
-    
-    if version:
-        from . import __version__
-        console.print(f"GitPilot version {__version__}")
-        return
+    ctx.ensure_object(dict)["use_cache"] = not no_cache
 
     # If a subcommand was invoked, let Click handle it
     if ctx.invoked_subcommand is not None:
         return
 
-    config = load_config()
-    logger = GitPilotLogger()
-    context_analyzer = ContextAnalyzer()
-
     if history:
-        show_history(logger)
+        show_history(GitPilotLogger())
         return
 
+    from .context_analyzer import ContextAnalyzer
+    from .git_executor import GitExecutor
+    context_analyzer = ContextAnalyzer(fetch_remote=refresh_remote)
+
     if not context_analyzer.is_git_repo():
         console.print("❌ Not a Git repository. Please run from inside a Git repository.", style="red")
         sys.exit(1)
 
     console.print("🚀 GitPilot is ready to help you with Git!", style="green")
-    
-    ai_engine = AIEngine()
-    
+
+    # Inspect the repository in the background while the model and request are chosen.
+    context_executor = ThreadPoolExecutor(max_workers=1)
+    context_future = context_executor.submit(context_analyzer.analyze_context)
+    context_executor.shutdown(wait=False)
+
+    config = load_config()
+    ai_engine = create_ai_engine(config)
+    models = ai_engine.get_available_models()
 
     selected_model = None
     if model:
-        if model in ai_engine.get_available_models():
-            selected_model = model
-            model_name = ai_engine.get_available_models()[model]["name"]
-            console.print(f"🤖 Using model: {model_name}", style="blue")
-        else:
-            console.print(f"❌ Invalid model choice: {model}", style="red")
-            sys.exit(1)
+        selected_model = model
+        model_name = models[model]["name"]
+        console.print(f"🤖 Using model: {model_name}", style="blue", markup=False)
     elif skip_model_selection:
         selected_model = config.get("default_model", "1")
-        model_name = ai_engine.get_available_models()[selected_model]["name"]
-        console.print(f"🤖 Using default model: {model_name}", style="blue")
+        model_name = models[selected_model]["name"]
+        console.print(f"🤖 Using default model: {model_name}", style="blue", markup=False)
     else:
-        selected_model = display_model_selection(ai_engine)
+        try:
+            selected_model = display_model_selection(models)
+        except EOFError:
+            # Input ran out (piped or redirected stdin), so nobody can pick a model.
+            console.print("\n❌ No model selected. Pass --model or --skip-model-selection when stdin is not a terminal.", style="red")
+            sys.exit(1)
     
     if not query:
-        query = click.prompt("\n💬 What would you like to do with Git?", type=str)
-
-    context = context_analyzer.analyze_context()
+        if sys.stdin.isatty():
+            query = click.prompt("\n💬 What would you like to do with Git?", type=str)
+        else:
+            # Piped or redirected input: take the request from its first line.
+            query = sys.stdin.readline().strip()
+            if not query:
+                console.print("❌ No request given on standard input.", style="red")
+                sys.exit(1)
 
-    with console.status("💭 Thinking..."):
-        safe_query = query if query is not None else ""
-        ai_response = ai_engine.generate_command(safe_query, context, selected_model)
+    safe_query = query if query is not None else ""
+    trivial_command = _TRIVIAL_QUERIES.get(safe_query.strip().lower())
+    # Needed either way: preview and execute check the command against it.
+    context = context_future.result()
+    if trivial_command:
+        ai_response = {"command": trivial_command, "explanation": f"'{safe_query.strip()}' maps directly to {trivial_command}"}
+    else:
+        with console.status("💭 Thinking...") as status:
+            received = [0]
+            def show_progress(fragment: str):
+                received[0] += len(fragment)
+                status.update(f"💭 Thinking... {received[0]} characters received")
+            ai_response = ai_engine.generate_command(safe_query, context, selected_model, on_text=show_progress)
 
     display_ai_response(ai_response, explain or config.get("explain_by_default", False))
 
@@ -142,20 +229,27 @@ def main(ctx: click.Context, query: Optional[str], dry_run: bool, explain: bool,
         console.print("❌ Could not generate a valid Git command.", style="red")
         sys.exit(1)
 
-    git_executor = GitExecutor()
+    logger = GitPilotLogger()
+    git_executor = GitExecutor(context_analyzer=context_analyzer)
     
     if dry_run:
-        result = git_executor.preview_command(ai_response["command"])
+        result = git_executor.preview_command(ai_response["command"], context)
         display_execution_result(result, is_preview=True)
     else:
         should_execute = True
         if git_executor.is_destructive_command(ai_response["command"]) and not yes:
-            should_execute = Confirm.ask(
-                f"Execute potentially destructive command: {ai_response['command']}?"
-            )
+            from rich.prompt import Confirm
+            try:
+                should_execute = Confirm.ask(
+                    f"Execute potentially destructive command: {ai_response['command']}?"
+                )
+            except EOFError:
+                # No answer can come from exhausted stdin; --yes confirms non-interactively.
+                console.print("\n⚠️ No confirmation on stdin; pass --yes to run destructive commands from scripts.", style="yellow")
+                should_execute = False
         
         if should_execute:
-            result = git_executor.execute(ai_response["command"], auto_confirm=yes)
+            result = git_executor.execute(ai_response["command"], auto_confirm=yes, context=context)
             display_execution_result(result)
             
             logger.log_command(
@@ -192,7 +286,7 @@ def display_execution_result(result: Dict, is_preview: bool = False):
         console.print(Panel(result["output"], title="Preview", border_style="blue"))
         if result.get("warnings"):
             for warning in result["warnings"]:
-                console.print(f"⚠️ Warning: {warning}", style="yellow")
+                console.print(f"⚠️ Warning: {warning}", style="yellow", markup=False)
         return
 
     if result["success"]:
@@ -206,7 +300,7 @@ def display_execution_result(result: Dict, is_preview: bool = False):
 
     if result.get("warnings"):
         for warning in result["warnings"]:
-            console.print(f"⚠️ Warning: {warning}", style="yellow")
+            console.print(f"⚠️ Warning: {warning}", style="yellow", markup=False)
 
 def show_history(logger: GitPilotLogger):
     """Show recent command history"""
@@ -215,24 +309,28 @@ def show_history(logger: GitPilotLogger):
         console.print("❌ No command history found.", style="yellow")
         return
 
-    console.print("🔍 Recent Commands:", style="bold")
+    # One render pass for the whole listing instead of one per line.
+    lines = [Text("🔍 Recent Commands:", style="bold")]
     for i, entry in enumerate(reversed(history), 1):
         status = "✅" if entry["success"] else "❌"
         timestamp = entry["timestamp"][:19]
-        console.print(f"\n{i}. {status} {timestamp}")
-        console.print(f"   Query: {entry['user_input']}")
-        console.print(f"   Command: {entry['git_command']}")
+        lines.append(Text(f"\n{i}. {status} {timestamp}"))
+        lines.append(Text(f"   Query: {entry['user_input']}"))
+        lines.append(Text(f"   Command: {entry['git_command']}"))
         if entry.get("error"):
-            console.print(f"   ❌ Error: {entry['error']}", style="red")
+            lines.append(Text(f"   ❌ Error: {entry['error']}", style="red"))
         if entry.get("output"):
-            console.print(f"   💬 Output: {entry['output']}")
+            lines.append(Text(f"   💬 Output: {entry['output']}"))
+    console.print(Group(*lines))
 
 @main.command()
 @click.option('--format', type=click.Choice(['text', 'json']), default='text', help='Output format')
 @click.option('--detailed', is_flag=True, help='Show detailed health analysis')
-@click.option('--model', '-m', type=str, help='AI model for analysis (1-4)')
+@click.option('--model', '-m', type=_MODEL_CHOICE, help='AI model for analysis (1-4)')
 def health(format: str, detailed: bool, model: Optional[str]):
     """Analyze repository health with AI-powered insights"""
+    from .context_analyzer import ContextAnalyzer
+    from .repo_health import RepositoryHealthMonitor
     context_analyzer = ContextAnalyzer()
     if not context_analyzer.is_git_repo():
         console.print("❌ Not a Git repository.", style="red")
@@ -242,10 +340,7 @@ def health(format: str, detailed: bool, model: Optional[str]):
     
     with console.status("🔍 Analyzing repository health..."):
         if detailed and model:
-            ai_engine = AIEngine()
-            if model not in ai_engine.get_available_models():
-                console.print(f"❌ Invalid model choice: {model}", style="red")
-                sys.exit(1)
+            ai_engine = create_ai_engine()
             report = health_monitor.get_comprehensive_health_report(ai_engine, model)
         else:
             report = health_monitor.get_comprehensive_health_report()
@@ -258,21 +353,18 @@ def health(format: str, detailed: bool, model: Optional[str]):
 @main.command()
 @click.argument('search_query')
 @click.option('--limit', default=50, help='Maximum number of commits to search')
-@click.option('--model', '-m', type=str, help='AI model for search (1-4)')
+@click.option('--model', '-m', type=_MODEL_CHOICE, help='AI model for search (1-4)')
 def search(search_query: str, limit: int, model: Optional[str]):
     """Search commit history using natural language"""
+    from .context_analyzer import ContextAnalyzer
     context_analyzer = ContextAnalyzer()
     if not context_analyzer.is_git_repo():
         console.print("❌ Not a Git repository.", style="red")
         sys.exit(1)
     
-    ai_engine = AIEngine()
+    ai_engine = create_ai_engine()
     selected_model = model or "1"
     
-    if selected_model not in ai_engine.get_available_models():
-        console.print(f"❌ Invalid model choice: {selected_model}", style="red")
-        sys.exit(1)
-    
     with console.status(f"🔍 Searching for: {search_query}..."):
         commit_history = context_analyzer.get_commit_history_for_search(limit)
         if not commit_history:
@@ -288,6 +380,7 @@ def search(search_query: str, limit: int, model: Optional[str]):
 @click.option('--format', type=click.Choice(['tree', 'table', 'json']), default='tree', help='Display format')
 def graph(max_commits: int, format: str):
     """Display visual Git commit graph"""
+    from .context_analyzer import ContextAnalyzer
     context_analyzer = ContextAnalyzer()
     if not context_analyzer.is_git_repo():
         console.print("❌ Not a Git repository.", style="red")
@@ -297,7 +390,7 @@ def graph(max_commits: int, format: str):
         graph_data = context_analyzer.get_git_graph_data(max_commits)
     
     if "error" in graph_data:
-        console.print(f"❌ {graph_data['error']}", style="red")
+        console.print(f"❌ {graph_data['error']}", style="red", markup=False)
         sys.exit(1)
     
     if format == 'json':
@@ -308,9 +401,10 @@ def graph(max_commits: int, format: str):
         display_graph_tree(graph_data)
 
 @main.command()
-@click.option('--model', '-m', type=str, help='AI model for conflict resolution (1-4)')
+@click.option('--model', '-m', type=_MODEL_CHOICE, help='AI model for conflict resolution (1-4)')
 def conflicts(model: Optional[str]):
     """Analyze and get AI assistance for merge conflicts"""
+    from .context_analyzer import ContextAnalyzer
     context_analyzer = ContextAnalyzer()
     if not context_analyzer.is_git_repo():
         console.print("❌ Not a Git repository.", style="red")
@@ -326,16 +420,12 @@ def conflicts(model: Optional[str]):
     display_conflict_info(conflict_info)
     
     if model and conflict_info.get("conflicted_files"):
-        ai_engine = AIEngine()
-        if model not in ai_engine.get_available_models():
-            console.print(f"❌ Invalid model choice: {model}", style="red")
-            sys.exit(1)
+        ai_engine = create_ai_engine()
         
-        # Get conflict content from first conflicted file for AI analysis
+        # Get the conflict hunks from the first conflicted file for AI analysis
         first_file = conflict_info["conflicted_files"][0]["file"]
         try:
-            with open(first_file, 'r', encoding='utf-8', errors='ignore') as f:
-                conflict_content = f.read()
+            conflict_content = context_analyzer.get_conflict_hunks(first_file)
             
             with console.status("🤖 Analyzing conflicts with AI..."):
                 context = context_analyzer.analyze_context()
@@ -343,13 +433,15 @@ def conflicts(model: Optional[str]):
             
             display_conflict_resolution(resolution)
         except Exception as e:
-            console.print(f"❌ Error reading conflict file: {str(e)}", style="red")
+            console.print(f"❌ Error reading conflict file: {str(e)}", style="red", markup=False)
 
 @main.command()
 @click.option('--security', is_flag=True, help='Focus on security analysis')
 @click.option('--performance', is_flag=True, help='Focus on performance metrics')
 def analyze(security: bool, performance: bool):
     """Advanced repository analysis"""
+    from .context_analyzer import ContextAnalyzer
+    from .repo_health import RepositoryHealthMonitor
     context_analyzer = ContextAnalyzer()
     if not context_analyzer.is_git_repo():
         console.print("❌ Not a Git repository.", style="red")
@@ -372,7 +464,7 @@ def analyze(security: bool, performance: bool):
 def display_health_report(report: Dict):
     """Display formatted health report"""
     if "error" in report:
-        console.print(f"❌ {report['error']}", style="red")
+        console.print(f"❌ {report['error']}", style="red", markup=False)
         return
     
     # Health scores
@@ -430,28 +522,32 @@ def display_health_report(report: Dict):
     if recommendations:
         console.print("\n🔧 Recommendations:", style="bold")
         for i, rec in enumerate(recommendations[:5], 1):
-            console.print(f"{i}. {rec}")
+            console.print(f"{i}. {rec}", markup=False)
 
 def display_search_results(results: Dict, query: str):
     """Display search results"""
-    console.print(f"🔍 Search results for: '{query}'", style="bold")
+    console.print(f"🔍 Search results for: '{query}'", style="bold", markup=False)
     
     matches = results.get("matches", [])
     if not matches:
         console.print("❌ No matches found.", style="yellow")
         return
     
+    # One render pass for all matches instead of one per line.
+    lines = []
     for i, match in enumerate(matches[:10], 1):
         relevance = match.get("relevance_score", 0)
-        relevance_bar = "█" * int(relevance * 10) + "░" * (10 - int(relevance * 10))
+        relevance_bar = _RELEVANCE_BARS[min(10, max(0, int(relevance * 10)))]
         
-        console.print(f"\n{i}. [{match.get('commit_sha', 'unknown')}] {match.get('message', 'No message')}")
-        console.print(f"   Relevance: {relevance_bar} ({relevance:.2f})")
+        lines.append(Text(f"\n{i}. [{match.get('commit_sha', 'unknown')}] {match.get('message', 'No message')}"))
+        lines.append(Text(f"   Relevance: {relevance_bar} ({relevance:.2f})"))
         if match.get("explanation"):
-            console.print(f"   Match: {match['explanation']}", style="dim")
+            lines.append(Text(f"   Match: {match['explanation']}", style="dim"))
+    console.print(Group(*lines))
 
 def display_graph_tree(graph_data: Dict):
     """Display Git graph as a tree"""
+    from rich.tree import Tree
     tree = Tree("📊 Git Commit Graph")
     
     current_branch = graph_data.get("current_branch", "unknown")
@@ -461,22 +557,20 @@ def display_graph_tree(graph_data: Dict):
     # Add branch information
     branches_node = tree.add("🌳 Branches")
     for branch in branches[:10]:  # Limit display
-        branch_style = "bold green" if branch.get("is_active") else "dim"
         branch_name = branch.get("name", "unknown")
         if branch.get("is_active"):
-            branch_name += " (current)"
-        branches_node.add(f"{branch_name}", style=branch_style)
+            branches_node.add(Text(f"{branch_name} (current)", style="bold green"))
+        else:
+            branches_node.add(Text(branch_name, style="dim"))
     
-    # Add recent commits
+    # Add recent commits; Text keeps "[sha]" and commit messages from being read as markup
     commits_node = tree.add("📝 Recent Commits")
     for commit in commits[:10]:  # Show recent 10
-        sha = commit.get("sha", "unknown")
-        message = commit.get("message", "No message")
-        author = commit.get("author", "Unknown")
-        is_merge = commit.get("is_merge", False)
-        
-        commit_icon = "🔀" if is_merge else "📝"
-        commits_node.add(f"{commit_icon} [{sha}] {message[:50]} - {author}")
+        commit_icon = "🔀" if commit.get("is_merge") else "📝"
+        commits_node.add(Text(
+            f"{commit_icon} [{commit.get('sha', 'unknown')}] "
+            f"{commit.get('message', 'No message')[:50]} - {commit.get('author', 'Unknown')}"
+        ))
     
     console.print(tree)
 
@@ -491,16 +585,17 @@ def display_graph_table(graph_data: Dict):
     table.add_column("Type", style="yellow")
     
     for commit in commits[:20]:  # Show recent 20
-        sha = commit.get("sha", "unknown")
         message = commit.get("message", "No message")
-        author = commit.get("author", "Unknown")
-        commit_type = "Merge" if commit.get("is_merge") else "Commit"
-        
         # Truncate long messages
         if len(message) > 60:
             message = message[:57] + "..."
-        
-        table.add_row(sha, message, author, commit_type)
+        # Text cells keep brackets in messages and names from being read as markup
+        table.add_row(
+            commit.get("sha", "unknown"),
+            Text(message),
+            Text(commit.get("author", "Unknown")),
+            "Merge" if commit.get("is_merge") else "Commit"
+        )
     
     console.print(table)
 
@@ -512,7 +607,7 @@ def display_conflict_info(conflict_info: Dict):
     merge_branch = conflict_info.get("merge_branch")
     
     if merge_branch:
-        console.print(f"Merging from branch: {merge_branch}", style="yellow")
+        console.print(f"Merging from branch: {merge_branch}", style="yellow", markup=False)
     
     table = Table(title="Conflicted Files")
     table.add_column("File", style="cyan")
@@ -543,7 +638,7 @@ def display_conflict_resolution(resolution: Dict):
     if commands:
         console.print("\n🔧 Recommended Commands:", style="bold")
         for i, cmd in enumerate(commands, 1):
-            console.print(f"{i}. {cmd}", style="cyan")
+            console.print(f"{i}. {cmd}", style="cyan", markup=False)
     
     auto_resolvable = resolution.get("auto_resolvable", False)
     if auto_resolvable:
@@ -554,7 +649,7 @@ def display_conflict_resolution(resolution: Dict):
 def display_security_results(results: Dict):
     """Display security analysis results"""
     if "error" in results:
-        console.print(f"❌ {results['error']}", style="red")
+        console.print(f"❌ {results['error']}", style="red", markup=False)
         return
     
     security_score = results.get("security_score", 0)
@@ -583,7 +678,7 @@ def display_security_results(results: Dict):
 def display_performance_results(results: Dict):
     """Display performance analysis results"""
     if "error" in results:
-        console.print(f"❌ {results['error']}", style="red")
+        console.print(f"❌ {results['error']}", style="red", markup=False)
         return
     
     console.print("⚡ Performance Analysis", style="bold")
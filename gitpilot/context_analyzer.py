@@ -1,43 +1,135 @@
+import re
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
-import os
-import subprocess
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 import git
 from git import exc
 
+from .prompts import CONFLICT_EXCERPT_CHARS
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+if pygit2 is not None:
+    _STAGED_STATUS = (
+        pygit2.GIT_STATUS_INDEX_NEW | pygit2.GIT_STATUS_INDEX_MODIFIED | pygit2.GIT_STATUS_INDEX_DELETED
+        | pygit2.GIT_STATUS_INDEX_RENAMED | pygit2.GIT_STATUS_INDEX_TYPECHANGE
+    )
+    _UNSTAGED_STATUS = (
+        pygit2.GIT_STATUS_WT_MODIFIED | pygit2.GIT_STATUS_WT_DELETED
+        | pygit2.GIT_STATUS_WT_RENAMED | pygit2.GIT_STATUS_WT_TYPECHANGE
+    )
+
+# analyze_context results are reused for this many seconds, so the CLI's context
+# and the executor's pre-run warnings share one round of git queries and fetch.
+# A change to HEAD or the index (checkout, commit, add, reset) drops them sooner.
+_CONTEXT_TTL = 30.0
+_CONTEXT_STAMP_FILES = ("HEAD", "index")
+
+# Words in a command that make its context warnings worth computing.
+_WARNING_TRIGGER_RE = re.compile("reset|rebase|force|clean|push|pull", re.IGNORECASE)
+_DESTRUCTIVE_TRIGGERS = frozenset({"reset", "rebase", "force", "clean"})
+
 
 class ContextAnalyzer:
-    def __init__(self, repo_path: str = "."):
+    def __init__(self, repo_path: str = ".", fetch_remote: bool = False):
         self.repo_path = repo_path
+        # Without fetch_remote, ahead/behind compare against the last fetched remote refs.
+        self.fetch_remote = fetch_remote
         self.repo = None
+        self._libgit2_repo = None
+        self._context = None
+        self._context_time = 0.0
+        self._context_stamp = None
+        self._context_lock = threading.Lock()
         self._init_repo()
     def _init_repo(self):
         try:
-            self.repo = git.Repo(self.repo_path)
-        except exc.InvalidGitRepositoryError:
+            self.repo = git.Repo(self.repo_path, search_parent_directories=True)
+        except (exc.InvalidGitRepositoryError, exc.NoSuchPathError):
             self.repo = None
+        # Status queries go through libgit2 in-process when pygit2 is installed.
+        if self.repo is not None and pygit2 is not None:
+            try:
+                self._libgit2_repo = pygit2.Repository(self.repo.git_dir)
+            except pygit2.GitError:
+                self._libgit2_repo = None
     def is_git_repo(self) -> bool:
         return self.repo is not None
     def analyze_context(self) -> Dict:
         if not self.is_git_repo() or self.repo is None:
             return {"error": "Not a Git repository"}
+        with self._context_lock:
+            stamp = self._repo_stamp()
+            if (self._context is None or stamp is None or stamp != self._context_stamp
+                    or time.monotonic() - self._context_time > _CONTEXT_TTL):
+                self._context = self._read_context()
+                self._context_time = time.monotonic()
+                self._context_stamp = stamp
+            return self._context
+    def _repo_stamp(self) -> Optional[Tuple[int, ...]]:
+        """mtimes of .git/HEAD and .git/index, or None if either can't be read."""
+        git_dir = Path(self.repo.git_dir)
+        try:
+            return tuple((git_dir / name).stat().st_mtime_ns for name in _CONTEXT_STAMP_FILES)
+        except OSError:
+            return None
+    def invalidate_context(self):
+        with self._context_lock:
+            self._context = None
+    def _read_context(self) -> Dict:
         try:
+            stash_list = self.repo.git.stash("list")
+            file_status = self._get_file_status_counts()
             context = {
                 "branch": self._get_current_branch(),
-                "is_dirty": self.repo.is_dirty() if self.repo else False,
-                "staged_files": len(list(self.repo.index.diff("HEAD"))) if self.repo else 0,
-                "unstaged_files": len(list(self.repo.index.diff(None))) if self.repo else 0,
-                "untracked_files": len(self.repo.untracked_files) if self.repo else 0,
+                "is_dirty": file_status["staged_files"] > 0 or file_status["unstaged_files"] > 0,
+                "staged_files": file_status["staged_files"],
+                "unstaged_files": file_status["unstaged_files"],
+                "untracked_files": file_status["untracked_files"],
                 "is_detached": self.repo.head.is_detached if self.repo else False,
                 "remote_status": self._get_remote_status(),
                 "last_commit": self._get_last_commit_info(),
-                "stash_count": len(self.repo.git.stash("list").splitlines()) if self.repo and self.repo.git.stash("list") else 0
+                # GitPython strips the trailing newline, so n stashes print n - 1 newlines.
+                "stash_count": stash_list.count("\n") + 1 if stash_list else 0
             }
             return context
         except Exception as e:
             return {"error": f"Failed to analyze context: {str(e)}"}
+    def _get_file_status_counts(self) -> Dict:
+        if self._libgit2_repo is not None:
+            staged = unstaged = untracked = 0
+            for flags in self._libgit2_repo.status().values():
+                if flags & _STAGED_STATUS:
+                    staged += 1
+                if flags & _UNSTAGED_STATUS:
+                    unstaged += 1
+                if flags & pygit2.GIT_STATUS_WT_NEW:
+                    untracked += 1
+            return {"staged_files": staged, "unstaged_files": unstaged, "untracked_files": untracked}
+        # One porcelain status call covers the index, the worktree and untracked files.
+        staged = unstaged = untracked = 0
+        entries = iter(self.repo.git.status("--porcelain=v1", "-z", "--untracked-files=all").split("\0"))
+        for entry in entries:
+            if len(entry) < 4:
+                continue
+            index_status, worktree_status = entry[0], entry[1]
+            if index_status == "?":
+                untracked += 1
+                continue
+            if index_status != " ":
+                staged += 1
+            if worktree_status != " ":
+                unstaged += 1
+            if index_status in "RC":
+                # Renames and copies are followed by their source path.
+                next(entries, None)
+        return {"staged_files": staged, "unstaged_files": unstaged, "untracked_files": untracked}
     def _get_current_branch(self) -> str:
         try:
             if self.repo is None:
@@ -52,11 +144,13 @@ class ContextAnalyzer:
             if self.repo is None:
                 return {"has_remote": False}
             origin = self.repo.remotes.origin
-            origin.fetch()
+            if self.fetch_remote:
+                origin.fetch()
             local_commit = self.repo.head.commit
             remote_commit = origin.refs[self.repo.active_branch.name].commit
-            behind = len(list(self.repo.iter_commits(f"{local_commit.hexsha}..{remote_commit.hexsha}")))
-            ahead = len(list(self.repo.iter_commits(f"{remote_commit.hexsha}..{local_commit.hexsha}")))
+            # "<ahead>\t<behind>" from one rev-list walk instead of two commit lists.
+            counts = self.repo.git.rev_list("--left-right", "--count", f"{local_commit.hexsha}...{remote_commit.hexsha}")
+            ahead, behind = (int(count) for count in counts.split())
             return {
                 "has_remote": True,
                 "ahead": ahead,
@@ -78,22 +172,26 @@ class ContextAnalyzer:
             }
         except:
             return {}
-    def get_context_warnings(self, command: str) -> List[str]:
+    def get_context_warnings(self, command: str, context: Optional[Dict] = None) -> List[str]:
+        """Warnings for running command in this repository; pass context to reuse an analysis."""
+        triggers = {word.lower() for word in _WARNING_TRIGGER_RE.findall(command)}
+        if not triggers:
+            return []
         warnings = []
-        context = self.analyze_context()
+        if context is None:
+            context = self.analyze_context()
         if "error" in context:
             return [context["error"]]
-        destructive_commands = ["reset", "rebase", "force", "clean"]
-        if any(cmd in command.lower() for cmd in destructive_commands):
-            if context["is_dirty"]:
+        if not triggers.isdisjoint(_DESTRUCTIVE_TRIGGERS):
+            if context.get("is_dirty"):
                 warnings.append("You have uncommitted changes. Consider stashing them first.")
-            if context["remote_status"]["behind"] > 0:
+            if context.get("remote_status", {}).get("behind", 0) > 0:
                 warnings.append("Your branch is behind remote. Consider pulling first.")
-        if "push" in command.lower():
-            if context["remote_status"]["behind"] > 0:
+        if "push" in triggers:
+            if context.get("remote_status", {}).get("behind", 0) > 0:
                 warnings.append("Your branch is behind remote. Consider pulling first.")
-        if "pull" in command.lower():
-            if context["is_dirty"]:
+        if "pull" in triggers:
+            if context.get("is_dirty"):
                 warnings.append("You have uncommitted changes. Consider stashing them first.")
         return warnings
 
@@ -118,15 +216,30 @@ class ContextAnalyzer:
 
     def get_commit_history_for_search(self, limit: int = 100) -> List[str]:
         """Get formatted commit history for semantic search."""
+        return [
+            f"{sha[:8]} | {author} | {date} | {message}"
+            for sha, author, date, message in self.get_commit_records(limit)
+        ]
+
+    def get_commit_records(self, limit: int = 100) -> List[Tuple[str, str, str, str]]:
+        """Get recent commits as (sha, author, date, message) tuples from a single git log call."""
         if not self.is_git_repo() or self.repo is None:
             return []
         
         try:
-            commits = []
-            for commit in self.repo.iter_commits(max_count=limit):
-                commit_info = f"{commit.hexsha[:8]} | {commit.author.name} | {commit.committed_datetime.strftime('%Y-%m-%d %H:%M')} | {commit.message.strip()}"
-                commits.append(commit_info)
-            return commits
+            # NUL separates fields and RS separates commits; neither can appear in a commit message.
+            log_output = self.repo.git.log(
+                f"--max-count={limit}",
+                "--date=format:%Y-%m-%d %H:%M",
+                "--format=%H%x00%an%x00%cd%x00%B%x1e"
+            )
+            records = []
+            for entry in log_output.split("\x1e"):
+                fields = entry.lstrip("\n").split("\x00")
+                if len(fields) == 4:
+                    sha, author, date, message = fields
+                    records.append((sha, author, date, message.strip()))
+            return records
         except Exception:
             return []
 
@@ -345,7 +458,7 @@ class ContextAnalyzer:
             has_gitignore = (repo_path / '.gitignore').exists()
             
             # Count untracked files
-            untracked_count = len(self.repo.untracked_files) if self.repo.untracked_files else 0
+            untracked_count = self._get_file_status_counts()["untracked_files"]
             
             # Estimate working tree files
             working_tree_files = sum(1 for f in repo_path.rglob('*') if f.is_file() and '.git' not in str(f))
@@ -372,6 +485,31 @@ class ContextAnalyzer:
         except Exception:
             return 0
 
+    def get_conflict_hunks(self, file_path: str, max_chars: int = CONFLICT_EXCERPT_CHARS) -> str:
+        """Return the conflict regions of a file, read line by line and capped at max_chars.
+
+        Falls back to the start of the file when it has no conflict markers.
+        """
+        full_path = Path(self.repo.working_dir) / file_path
+        hunks = []
+        size = 0
+        in_hunk = False
+        with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                if line.startswith('<<<<<<<'):
+                    in_hunk = True
+                if in_hunk:
+                    hunks.append(line)
+                    size += len(line)
+                    if size >= max_chars:
+                        break
+                    if line.startswith('>>>>>>>'):
+                        in_hunk = False
+            if not hunks:
+                f.seek(0)
+                return f.read(max_chars)
+        return "".join(hunks)[:max_chars]
+
     def _get_merge_branch_name(self) -> Optional[str]:
         """Get the name of the branch being merged."""
         try:
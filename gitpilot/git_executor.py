@@ -1,25 +1,31 @@
-import shlex
+import re
 import subprocess
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Optional
 
 from .context_analyzer import ContextAnalyzer
 from .logger import GitPilotLogger
 
+_DESTRUCTIVE_COMMANDS = MappingProxyType({
+    "reset --hard": "This will discard all uncommitted changes",
+    "clean -f": "This will delete untracked files permanently",
+    "push --force": "This will overwrite remote history",
+    "rebase": "This will rewrite commit history",
+    "cherry-pick": "This may create conflicts",
+    "merge --no-ff": "This will create a merge commit"
+})
+# Any destructive fragment, anywhere in the command, in one case-insensitive scan.
+_DESTRUCTIVE_RE = re.compile("|".join(map(re.escape, _DESTRUCTIVE_COMMANDS)), re.IGNORECASE)
+
 
 class GitExecutor:
-    def __init__(self, repo_path: str = "."):
+    def __init__(self, repo_path: str = ".", context_analyzer: Optional[ContextAnalyzer] = None):
         self.repo_path = repo_path
         self.logger = GitPilotLogger()
-        self.context_analyzer = ContextAnalyzer(repo_path)
-        self.destructive_commands = {
-            "reset --hard": "This will discard all uncommitted changes",
-            "clean -f": "This will delete untracked files permanently",
-            "push --force": "This will overwrite remote history",
-            "rebase": "This will rewrite commit history",
-            "cherry-pick": "This may create conflicts",
-            "merge --no-ff": "This will create a merge commit"
-        }
-    def execute(self, command: str, dry_run: bool = False, auto_confirm: bool = False) -> Dict:
+        self.context_analyzer = context_analyzer or ContextAnalyzer(repo_path)
+        self.destructive_commands = _DESTRUCTIVE_COMMANDS
+    def execute(self, command: str, dry_run: bool = False, auto_confirm: bool = False,
+                context: Optional[Dict] = None) -> Dict:
         if not command or not command.strip().startswith("git"):
             return {
                 "success": False,
@@ -29,7 +35,7 @@ class GitExecutor:
             }
         clean_command = self._clean_command(command)
         warnings = self._check_destructive_operations(clean_command)
-        context_warnings = self.context_analyzer.get_context_warnings(clean_command)
+        context_warnings = self.context_analyzer.get_context_warnings(clean_command, context)
         all_warnings = warnings + context_warnings
         if dry_run:
             return {
@@ -49,6 +55,7 @@ class GitExecutor:
                 cwd=self.repo_path,
                 timeout=30
             )
+            self.context_analyzer.invalidate_context()
             success = result.returncode == 0
             if success:
                 self.logger.log_command(
@@ -59,7 +66,7 @@ class GitExecutor:
                     error=""
                 )
                 if result.stderr:
-                    self.logger.log_warning(f"Command warnings: {result.stderr}")
+                    self.logger.log_warning("Command warnings: {}", result.stderr)
             else:
                 self.logger.log_command(
                     user_input="",
@@ -105,14 +112,12 @@ class GitExecutor:
         return command
     def _check_destructive_operations(self, command: str) -> List[str]:
         warnings = []
+        command = command.lower()
         for destructive_cmd, warning in self.destructive_commands.items():
-            if destructive_cmd in command.lower():
+            if destructive_cmd in command:
                 warnings.append(f"  {warning}")
         return warnings
-    def preview_command(self, command: str) -> Dict:
-        return self.execute(command, dry_run=True)
+    def preview_command(self, command: str, context: Optional[Dict] = None) -> Dict:
+        return self.execute(command, dry_run=True, context=context)
     def is_destructive_command(self, command: str) -> bool:
-        return any(
-            destructive_cmd in command.lower()
-            for destructive_cmd in self.destructive_commands.keys()
-        )
\ No newline at end of file
+        return _DESTRUCTIVE_RE.search(command) is not None
\ No newline at end of file
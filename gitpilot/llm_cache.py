@@ -0,0 +1,64 @@
+"""
+GitPilot LLM Response Cache
+Raw AI replies kept on disk so repeated prompts skip the provider round trip
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_TTL = 7 * 24 * 60 * 60
+# Rows kept after pruning; the least recently used go first.
+_MAX_ENTRIES = 5000
+
+
+class LLMCache:
+    def __init__(self, path: Optional[str] = None, ttl: int = DEFAULT_TTL):
+        self.path = Path(path) if path else Path.home() / ".gitpilot" / "cache" / "llm_responses.sqlite3"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # Autocommit mode; WAL lets concurrent GitPilot processes read while one writes.
+        self._conn = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key BLOB PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, ts INTEGER NOT NULL)"
+        )
+        self._prune()
+    @staticmethod
+    def make_key(model: str, system_prompt: str, prompt: str) -> bytes:
+        return hashlib.blake2b(f"{model}\0{system_prompt}\0{prompt}".encode(), digest_size=16).digest()
+    def get(self, key: bytes) -> Optional[str]:
+        """Return the cached reply for key, refreshing its last-used time, or None."""
+        now = int(time.time())
+        with self._lock:
+            row = self._conn.execute("SELECT response, ts FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now - self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET ts = ? WHERE key = ?", (now, key))
+        return row[0]
+    def put(self, key: bytes, model: str, response: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, ts) VALUES (?, ?, ?, ?)",
+                (key, model, response, int(time.time()))
+            )
+    def close(self):
+        with self._lock:
+            self._conn.close()
+    def _prune(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE ts < ?", (int(time.time()) - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+                (_MAX_ENTRIES,)
+            )
@@ -1,23 +1,73 @@
+import atexit
 import json
+import queue
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from loguru import logger
 
+# Log file -> loguru sink id, so each file gets one sink however many loggers exist.
+_file_sinks: Dict[Path, int] = {}
+
+# History files are rewritten by one background thread so log_command returns without
+# waiting on disk; the exit hook drains it before the process ends.
+_history_queue: "queue.Queue[Tuple[Path, List[Dict]]]" = queue.Queue()
+_history_writer: Optional[threading.Thread] = None
+_history_writer_lock = threading.Lock()
+
+
+def _write_history_forever():
+    while True:
+        pending = [_history_queue.get()]
+        while True:
+            try:
+                pending.append(_history_queue.get_nowait())
+            except queue.Empty:
+                break
+        # Only the newest snapshot of each file needs writing.
+        latest = {path: history for path, history in pending}
+        for path, history in latest.items():
+            try:
+                with open(path, 'w') as f:
+                    json.dump(history, f, indent=2)
+            except (OSError, TypeError, ValueError) as e:
+                logger.error("Failed to save command history: {}", e)
+        for _ in pending:
+            _history_queue.task_done()
+
+
+def _save_history_in_background(path: Path, history: List[Dict]):
+    global _history_writer
+    with _history_writer_lock:
+        if _history_writer is None:
+            _history_writer = threading.Thread(target=_write_history_forever, name="gitpilot-history", daemon=True)
+            _history_writer.start()
+            atexit.register(flush_history)
+    _history_queue.put((path, list(history)))
+
+
+def flush_history():
+    """Block until every queued history write has reached disk."""
+    _history_queue.join()
+
 
 class GitPilotLogger:
     def __init__(self, log_dir: Optional[str] = None):
         self.log_dir = Path(log_dir) if log_dir else Path.home() / ".gitpilot"
         self.log_dir.mkdir(exist_ok=True)
         log_file = self.log_dir / "gitpilot.log"
-        logger.add(
-            log_file,
-            rotation="10 MB",
-            retention="30 days",
-            level="INFO",
-            format="{time} | {level} | {message}"
-        )
+        if log_file not in _file_sinks:
+            # enqueue=True hands records to loguru's writer thread, so logging calls don't block on disk.
+            _file_sinks[log_file] = logger.add(
+                log_file,
+                rotation="10 MB",
+                retention="30 days",
+                level="INFO",
+                format="{time} | {level} | {message}",
+                enqueue=True
+            )
         self.history_file = self.log_dir / "command_history.json"
         self.history = self._load_history()
     def _load_history(self) -> List[Dict]:
@@ -29,8 +79,9 @@ class GitPilotLogger:
                 return []
         return []
     def _save_history(self):
-        with open(self.history_file, 'w') as f:
-            json.dump(self.history, f, indent=2)
+        _save_history_in_background(self.history_file, self.history)
+    def flush(self):
+        flush_history()
     def log_command(self, user_input: str, git_command: str, success: bool, output: str = "", error: str = ""):
         entry = {
             "timestamp": datetime.now().isoformat(),
@@ -43,16 +94,19 @@ class GitPilotLogger:
         self.history.append(entry)
         self._save_history()
         status = "SUCCESS" if success else "FAILED"
-        logger.info(f"{status}: '{user_input}' -> '{git_command}'")
+        logger.info("{}: '{}' -> '{}'", status, user_input, git_command)
         if error:
-            logger.error(f"Command failed: {error}")
+            logger.error("Command failed: {}", error)
+    # Arguments are formatted into "{}" placeholders by loguru only once a sink accepts the record.
     def log_ai_query(self, query: str, response: str, provider: str):
-        logger.info(f"AI Query [{provider}]: {query[:100]}...")
-        logger.debug(f"AI Response: {response}")
-    def log_error(self, error: str):
-        logger.error(error)
-    def log_warning(self, message: str):
-        logger.warning(message)
+        logger.info("AI Query [{}]: {:.100}...", provider, query)
+        logger.debug("AI Response: {}", response)
+    def log_info(self, message: str, *args):
+        logger.info(message, *args)
+    def log_error(self, error: str, *args):
+        logger.error(error, *args)
+    def log_warning(self, message: str, *args):
+        logger.warning(message, *args)
     def get_recent_history(self, limit: int = 10) -> List[Dict]:
         return self.history[-limit:]
     def get_history_by_date(self, date: str) -> List[Dict]:
@@ -0,0 +1,10 @@
+from types import MappingProxyType
+
+# The model menu, kept apart from the engine so the CLI can validate --model
+# without importing the provider code.
+AVAILABLE_MODELS = MappingProxyType({
+    "1": MappingProxyType({"name": "Gemini 2.0 Flash", "provider": "gemini", "model": "gemini-2.0-flash"}),
+    "2": MappingProxyType({"name": "Llama 3.1 8B Instant", "provider": "groq", "model": "llama-3.1-8b-instant"}),
+    "3": MappingProxyType({"name": "Llama 3.3 70B Versatile", "provider": "groq", "model": "llama-3.3-70b-versatile"}),
+    "4": MappingProxyType({"name": "DeepSeek R1 Distill Llama 70B", "provider": "groq", "model": "deepseek-r1-distill-llama-70b"})
+})
@@ -32,6 +32,8 @@ Context Information:
 - Unstaged files: {unstaged_files}
 - Remote status: {remote_status}
 """
+# Characters of a conflicted file sent with a conflict-resolution prompt.
+CONFLICT_EXCERPT_CHARS = 4096
 CONTEXT_PROMPT = """
 Based on the current Git repository state:
 - Branch: {branch}
@@ -0,0 +1,43 @@
+"""
+GitPilot Rate Limiting
+Client-side token buckets that keep AI calls under provider request quotas
+"""
+
+import asyncio
+import math
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Allow rate_per_min calls a minute on average, in bursts of up to burst calls.
+
+    Callers over the limit wait for their turn instead of failing. Each call
+    reserves a token up front, so concurrent waiters are served in arrival order.
+    """
+    def __init__(self, rate_per_min: float, burst: Optional[int] = None):
+        if isinstance(rate_per_min, bool) or not isinstance(rate_per_min, (int, float)) or not 0 < rate_per_min < math.inf:
+            raise ValueError(f"requests per minute must be a positive number, got {rate_per_min!r}")
+        self.rate = rate_per_min / 60.0
+        # Ten seconds' worth of calls unless told otherwise.
+        self.capacity = burst if burst is not None else max(1, round(rate_per_min / 6))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+    async def acquire_async(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before it is valid."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
@@ -3,8 +3,7 @@ GitPilot Repository Health Monitor
 Advanced repository health analysis and monitoring for GitPilot 2.0.0
 """
 
-import json
-import os
+import re
 from typing import Dict, List
 from pathlib import Path
 
@@ -12,6 +11,18 @@ from .context_analyzer import ContextAnalyzer
 from .ai_engine import AIEngine
 from .logger import GitPilotLogger
 
+# Security score points deducted per issue, by severity.
+_SEVERITY_PENALTIES = {"high": 30, "medium": 15, "low": 5}
+
+# Simple regex patterns for common secrets, compiled once for every scanned file.
+_SECRET_PATTERNS = tuple((re.compile(pattern, re.IGNORECASE), secret_type) for pattern, secret_type in (
+    (r'api[_-]?key[\'"\s]*[:=][\'"\s]*[a-zA-Z0-9]{20,}', 'API Key'),
+    (r'secret[_-]?key[\'"\s]*[:=][\'"\s]*[a-zA-Z0-9]{20,}', 'Secret Key'),
+    (r'password[\'"\s]*[:=][\'"\s]*[^\s\'"]{8,}', 'Password'),
+    (r'token[\'"\s]*[:=][\'"\s]*[a-zA-Z0-9]{20,}', 'Token'),
+))
+_SECRET_SCAN_SUFFIXES = frozenset({'.py', '.js', '.ts', '.env', '.config', '.json', '.yaml', '.yml'})
+
 
 class RepositoryHealthMonitor:
     def __init__(self, repo_path: str = "."):
@@ -54,7 +65,7 @@ class RepositoryHealthMonitor:
             return health_stats
             
         except Exception as e:
-            self.logger.log_error(f"Health report generation failed: {str(e)}")
+            self.logger.log_error("Health report generation failed: {}", e)
             return {"error": f"Failed to generate health report: {str(e)}"}
     
     def get_security_scan_results(self) -> Dict:
@@ -203,23 +214,14 @@ class RepositoryHealthMonitor:
         try:
             repo_path = Path(self.repo_path)
             
-            # Simple regex patterns for common secrets
-            secret_patterns = [
-                (r'api[_-]?key[\'"\s]*[:=][\'"\s]*[a-zA-Z0-9]{20,}', 'API Key'),
-                (r'secret[_-]?key[\'"\s]*[:=][\'"\s]*[a-zA-Z0-9]{20,}', 'Secret Key'),
-                (r'password[\'"\s]*[:=][\'"\s]*[^\s\'"]{8,}', 'Password'),
-                (r'token[\'"\s]*[:=][\'"\s]*[a-zA-Z0-9]{20,}', 'Token'),
-            ]
-            
             for file_path in repo_path.rglob('*'):
-                if file_path.is_file() and file_path.suffix in ['.py', '.js', '.ts', '.env', '.config', '.json', '.yaml', '.yml']:
+                if file_path.suffix in _SECRET_SCAN_SUFFIXES and file_path.is_file():
                     try:
                         with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                             content = f.read()
                             
-                        import re
-                        for pattern, secret_type in secret_patterns:
-                            if re.search(pattern, content, re.IGNORECASE):
+                        for pattern, secret_type in _SECRET_PATTERNS:
+                            if pattern.search(content):
                                 issues.append({
                                     "type": "potential_secret",
                                     "severity": "high",
@@ -261,13 +263,9 @@ class RepositoryHealthMonitor:
         if not security_issues:
             return 100
         
-        high_severity = sum(1 for issue in security_issues if issue.get("severity") == "high")
-        medium_severity = sum(1 for issue in security_issues if issue.get("severity") == "medium")
-        low_severity = sum(1 for issue in security_issues if issue.get("severity") == "low")
-        
-        # Deduct points based on severity
-        score = 100 - (high_severity * 30) - (medium_severity * 15) - (low_severity * 5)
-        return max(score, 0)
+        # Deduct points based on severity, in a single pass over the issues
+        penalty = sum(_SEVERITY_PENALTIES.get(issue.get("severity"), 0) for issue in security_issues)
+        return max(100 - penalty, 0)
     
     def _get_security_recommendations(self, security_issues: List[Dict]) -> List[str]:
         """Get security recommendations based on issues."""
@@ -4,8 +4,19 @@ GitPilot 2.0.0 Feature Test Script
 Test all the new features implemented in GitPilot 2.0.0
 """
 
+import asyncio
+import math
 import os
 import json
+import re
+import subprocess
+import threading
+import time
+from types import SimpleNamespace
+
+import click
+import pytest
+from click.testing import CliRunner
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
@@ -14,7 +25,11 @@ from rich.tree import Tree
 # Import GitPilot modules
 from gitpilot.repo_health import RepositoryHealthMonitor
 from gitpilot.context_analyzer import ContextAnalyzer
-from gitpilot.ai_engine import AIEngine
+from gitpilot import ai_engine, cli, llm_cache, ratelimit
+from gitpilot.ai_engine import AIEngine, _COMMAND_SYSTEM_MESSAGE
+from gitpilot.cli import _DEFAULT_CONFIG, create_ai_engine, main as cli_main
+from gitpilot.llm_cache import LLMCache
+from gitpilot.ratelimit import TokenBucket
 
 console = Console()
 
@@ -215,6 +230,494 @@ def test_ai_features():
     
     console.print("✅ AI features test completed!\n")
 
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """AIEngine whose log, history and reply cache live under tmp_path"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return AIEngine()
+
+def test_llm_cache_round_trip(tmp_path):
+    """Replies come back for the same key, across connections"""
+    path = str(tmp_path / "replies.sqlite3")
+    cache = LLMCache(path)
+    key = LLMCache.make_key("model", "system", "show status")
+    assert cache.get(key) is None
+    cache.put(key, "model", '{"command": "git status"}')
+    assert cache.get(key) == '{"command": "git status"}'
+    assert cache.get(LLMCache.make_key("model", "system", "show log")) is None
+    cache.close()
+    assert LLMCache(path).get(key) == '{"command": "git status"}'
+
+def test_llm_cache_expires_entries(tmp_path, monkeypatch):
+    """Entries older than the TTL are dropped when read"""
+    now = [1_000_000]
+    monkeypatch.setattr(llm_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    cache = LLMCache(str(tmp_path / "replies.sqlite3"), ttl=60)
+    key = LLMCache.make_key("model", "system", "show status")
+    cache.put(key, "model", "reply")
+    now[0] += 60
+    assert cache.get(key) == "reply"
+    now[0] += 61
+    assert cache.get(key) is None
+
+def test_llm_cache_prunes_least_recently_used(tmp_path, monkeypatch):
+    """Reopening the cache keeps only the _MAX_ENTRIES most recently used rows"""
+    now = [1_000_000]
+    monkeypatch.setattr(llm_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    monkeypatch.setattr(llm_cache, "_MAX_ENTRIES", 2)
+    path = str(tmp_path / "replies.sqlite3")
+    cache = LLMCache(path)
+    keys = [LLMCache.make_key("model", "system", prompt) for prompt in ("a", "b", "c")]
+    for key in keys:
+        now[0] += 1
+        cache.put(key, "model", key.hex())
+    now[0] += 1
+    assert cache.get(keys[0]) == keys[0].hex()
+    cache.close()
+    reopened = LLMCache(path)
+    assert reopened.get(keys[0]) == keys[0].hex()
+    assert reopened.get(keys[1]) is None
+    assert reopened.get(keys[2]) == keys[2].hex()
+
+def test_reply_cache_serves_repeated_prompts(engine):
+    """A second identical prompt is answered from disk, not the provider"""
+    calls = []
+    engine._fetch_stream = lambda *args: calls.append(args) or '{"command": "git status"}'
+    for _ in range(2):
+        reply = engine._stream_reply(
+            "groq", "model", _COMMAND_SYSTEM_MESSAGE, "show status", 100, engine._is_command_reply
+        )
+        assert reply == '{"command": "git status"}'
+    assert len(calls) == 1
+
+def test_unusable_replies_are_not_cached(engine):
+    """Replies that parse to no command, or to no JSON object, are asked for again"""
+    calls = []
+    engine._fetch_stream = lambda *args: calls.append(args) or "I am not sure what you mean."
+    for _ in range(2):
+        result = engine.generate_command("frobnicate the repo", {}, "2")
+        assert result["command"] is None
+    assert len(calls) == 2
+    engine._fetch_stream = lambda *args: calls.append(args) or "No conflicts to resolve"
+    for _ in range(2):
+        engine.resolve_merge_conflict("<<<<<<< HEAD", {}, "2")
+    assert len(calls) == 4
+    engine._fetch_stream = lambda *args: calls.append(args) or '{"resolution_strategy": "keep ours"}'
+    for _ in range(2):
+        assert engine.resolve_merge_conflict("<<<<<<< HEAD", {}, "2")["resolution_strategy"] == "keep ours"
+    assert len(calls) == 5
+
+def test_no_cache_skips_reply_cache(tmp_path, monkeypatch):
+    """use_cache=False, as set by --no-cache, never reads or writes either cache tier"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    with click.Context(cli_main, obj={"use_cache": False}):
+        engine = create_ai_engine(dict(_DEFAULT_CONFIG))
+    assert engine._reply_cache is None
+    calls = []
+    engine._fetch_stream = lambda *args: calls.append(args) or '{"command": "git status"}'
+    for _ in range(2):
+        result = engine.generate_command("show status", {}, "2")
+        assert result["command"] == "git status"
+    assert len(calls) == 2
+    assert not (tmp_path / ".gitpilot" / "cache").exists()
+
+@pytest.mark.parametrize("rate", [0, -5, None, True, "30", math.nan, math.inf])
+def test_token_bucket_rejects_invalid_rates(rate):
+    """Only finite positive numbers are accepted as requests per minute"""
+    with pytest.raises(ValueError):
+        TokenBucket(rate)
+
+def test_token_bucket_burst_and_delay(monkeypatch):
+    """A full bucket allows a burst, then each call waits one token's worth"""
+    now = [100.0]
+    monkeypatch.setattr(ratelimit, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    bucket = TokenBucket(60)
+    assert bucket.capacity == 10
+    assert [bucket._reserve() for _ in range(10)] == [0.0] * 10
+    assert bucket._reserve() == pytest.approx(1.0)
+    assert bucket._reserve() == pytest.approx(2.0)
+    now[0] += 2.5
+    assert bucket._reserve() == pytest.approx(0.5)
+    # Idle time refills at most the burst capacity.
+    now[0] += 1000
+    assert [bucket._reserve() for _ in range(10)] == [0.0] * 10
+    assert bucket._reserve() == pytest.approx(1.0)
+    assert TokenBucket(60, burst=2).capacity == 2
+
+class _ProviderError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+def _failing_fetch(calls, errors, reply):
+    def fetch(*args):
+        calls.append(args)
+        if errors:
+            raise errors.pop(0)
+        return reply
+    return fetch
+
+def test_rate_limited_calls_retry_with_backoff(engine, monkeypatch):
+    """A 429 is retried after 1s, 2s, 4s; any other error is raised at once"""
+    sleeps = []
+    monkeypatch.setattr(ai_engine, "time", SimpleNamespace(sleep=sleeps.append, monotonic=ai_engine.time.monotonic))
+    engine._rate_limits["groq"] = TokenBucket(6000)
+    calls = []
+    engine._fetch_stream = _failing_fetch(calls, [_ProviderError(429), _ProviderError(429)], '{"command": "git status"}')
+    reply = engine._stream_reply("groq", "model", _COMMAND_SYSTEM_MESSAGE, "show status", 100, engine._is_command_reply)
+    assert reply == '{"command": "git status"}'
+    assert (len(calls), sleeps) == (3, [1.0, 2.0])
+
+    sleeps.clear()
+    engine._fetch_stream = _failing_fetch(calls, [_ProviderError(429)] * 4, "unused")
+    with pytest.raises(_ProviderError):
+        engine._stream_reply("groq", "model", _COMMAND_SYSTEM_MESSAGE, "show log", 100, engine._is_command_reply)
+    assert sleeps == [1.0, 2.0, 4.0]
+
+    sleeps.clear()
+    engine._fetch_stream = _failing_fetch(calls, [_ProviderError(500)], "unused")
+    with pytest.raises(_ProviderError):
+        engine._stream_reply("groq", "model", _COMMAND_SYSTEM_MESSAGE, "show diff", 100, engine._is_command_reply)
+    assert sleeps == []
+
+def test_async_rate_limited_calls_retry_with_backoff(engine, monkeypatch):
+    """The async path retries a 429 the same way and re-raises anything else"""
+    sleeps = []
+    async def sleep(delay):
+        sleeps.append(delay)
+    monkeypatch.setattr(ai_engine.asyncio, "sleep", sleep)
+    engine._rate_limits["groq"] = TokenBucket(6000)
+    calls = []
+    def afetch(errors, reply):
+        fetch = _failing_fetch(calls, errors, reply)
+        async def fetch_async(*args):
+            return fetch(*args)
+        return fetch_async
+    engine._afetch = afetch([_ProviderError(429)], '{"command": "git status"}')
+    reply = asyncio.run(engine._areply("groq", "model", _COMMAND_SYSTEM_MESSAGE, "show status", 100, engine._is_command_reply))
+    assert reply == '{"command": "git status"}'
+    assert (len(calls), sleeps) == (2, [1.0])
+
+    sleeps.clear()
+    engine._afetch = afetch([_ProviderError(401)], "unused")
+    with pytest.raises(_ProviderError):
+        asyncio.run(engine._areply("groq", "model", _COMMAND_SYSTEM_MESSAGE, "show log", 100, engine._is_command_reply))
+    assert sleeps == []
+
+@pytest.mark.parametrize("first, second, same", [
+    ("show status", "  please show   status. ", True),
+    ("show status", "Could you show status?!", True),
+    ("log main", "log main.", True),
+    ("log main", "log main..", False),
+    ("log main..", "log main...", False),
+    ("diff HEAD", "diff HEAD...", False),
+    ("log main..", "log main..!", True),
+    ("checkout Main", "checkout main", False),
+    ("show a file", "show file", False),
+])
+def test_near_duplicate_key(engine, first, second, same):
+    """Near-duplicate keys ignore politeness and sentence punctuation, never revision ranges"""
+    key = engine._semantic_cache_key
+    assert (key(first, {}, "1") == key(second, {}, "1")) is same
+
+class _FakeAsyncGroq:
+    def __init__(self):
+        self.closed = False
+    async def close(self):
+        self.closed = True
+
+def test_batch_generation_dedupes_and_reuses_cache(engine, monkeypatch):
+    """Repeated requests are sent once and cached ones not at all, on the batch and async paths"""
+    clients = []
+    monkeypatch.setattr(ai_engine, "_async_groq_client", lambda api_key: clients.append(_FakeAsyncGroq()) or clients[-1])
+    sent = []
+    async def generate(groq_client, user_input, context, model_name):
+        sent.append(user_input)
+        return {"command": f"git {user_input}", "explanation": "", "warning": None}
+    engine._agenerate_with_groq = generate
+    results = engine.generate_commands_batch(["status", "log", "status"], {}, "2")
+    assert [result["command"] for result in results] == ["git status", "git log", "git status"]
+    assert sent == ["status", "log"]
+    assert all(client.closed for client in clients)
+    assert asyncio.run(engine.generate_command_async("log", {}, "2"))["command"] == "git log"
+    results = engine.generate_commands_batch(["log", "diff", "status"], {}, "2")
+    assert [result["command"] for result in results] == ["git log", "git diff", "git status"]
+    assert sent == ["status", "log", "diff"]
+
+def test_batch_generation_reports_client_setup_failure(engine, monkeypatch):
+    """A client that cannot be built fails every pending request instead of raising"""
+    def missing_client(api_key):
+        raise ImportError("No module named 'groq'")
+    monkeypatch.setattr(ai_engine, "_async_groq_client", missing_client)
+    results = engine.generate_commands_batch(["status", "log", "status"], {}, "2")
+    assert len(results) == 3
+    for result in results:
+        assert result["command"] is None
+        assert "No module named 'groq'" in result["explanation"]
+    result = asyncio.run(engine.generate_command_async("status", {}, "2"))
+    assert result["command"] is None
+    assert "No module named 'groq'" in result["explanation"]
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=GitPilot", "-c", "user.email=gitpilot@example.com", *args],
+        cwd=repo, check=True, capture_output=True
+    )
+
+@pytest.fixture
+def git_repo(tmp_path, monkeypatch):
+    """An empty-history repository with one committed file, as the working directory"""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    (repo / "README.md").write_text("GitPilot\n")
+    _git(repo, "add", "README.md")
+    _git(repo, "commit", "-q", "-m", "Initial commit")
+    monkeypatch.chdir(repo)
+    return repo
+
+@pytest.mark.parametrize("query, command", [("status", "git status"), ("Log", "git log --oneline -20")])
+def test_trivial_queries_bypass_engine(git_repo, tmp_path, monkeypatch, query, command):
+    """Read-only one-word requests map straight to a command without asking a model"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(cli, "_CONFIG_PATH", str(tmp_path / "config.yaml"))
+    def generate_command(*args, **kwargs):
+        raise AssertionError("the engine should not be asked")
+    monkeypatch.setattr(AIEngine, "generate_command", generate_command)
+    analyses = []
+    analyze_context = ContextAnalyzer.analyze_context
+    monkeypatch.setattr(ContextAnalyzer, "analyze_context", lambda self: analyses.append(1) or analyze_context(self))
+    result = CliRunner().invoke(cli_main, ["--skip-model-selection", "--dry-run", query])
+    assert result.exit_code == 0, result.output
+    assert command in result.output
+    assert len(analyses) == 1
+
+@pytest.mark.parametrize("query", ["pull", "stash"])
+def test_state_changing_words_ask_engine(git_repo, tmp_path, monkeypatch, query):
+    """Requests that change the work tree still go to the model for its warnings"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(cli, "_CONFIG_PATH", str(tmp_path / "config.yaml"))
+    asked = []
+    def generate_command(self, user_input, context, model_choice, on_text=None):
+        asked.append((user_input, context["branch"]))
+        return {"command": None, "explanation": "stubbed", "warning": None}
+    monkeypatch.setattr(AIEngine, "generate_command", generate_command)
+    result = CliRunner().invoke(cli_main, ["--skip-model-selection", "--dry-run", query])
+    assert result.exit_code == 1
+    assert asked == [(query, "main")]
+
+def _search_reply(prompt):
+    """Stub search reply: the chunk's first commit, scored by its index; chunks holding c040 fail"""
+    shas = re.findall(r"^(c\d{3}) ", prompt, re.MULTILINE)
+    if "c040" in shas:
+        raise RuntimeError("chunk failed")
+    first = int(shas[0][1:])
+    return json.dumps({
+        "matches": [{"commit_sha": shas[0], "relevance_score": first / 100}],
+        "summary": f"best is {shas[0]}",
+    })
+
+_SEARCH_HISTORY = [f"c{i:03d} change {i}" for i in range(250)]
+
+def test_commit_search_merges_chunks(engine):
+    """Chunk matches merge best first, failed chunks are reported, and requests are capped"""
+    prompts = []
+    engine._stream_reply = lambda provider, model, system, prompt, *args: prompts.append(prompt) or _search_reply(prompt)
+    result = engine.semantic_commit_search("anything", _SEARCH_HISTORY, "2")
+    assert len(prompts) == 5
+    assert [match["commit_sha"] for match in result["matches"]] == ["c080", "c060", "c020", "c000"]
+    assert result["summary"] == "best is c080 (1 of 5 batches of commits could not be searched.)"
+
+    prompts.clear()
+    result = engine.semantic_commit_search("anything", _SEARCH_HISTORY[:30], "2")
+    assert len(prompts) == 2
+    assert result == {"matches": [{"commit_sha": "c020", "relevance_score": 0.2},
+                                  {"commit_sha": "c000", "relevance_score": 0.0}],
+                      "summary": "best is c020"}
+
+    result = engine.semantic_commit_search("anything", _SEARCH_HISTORY[40:50], "2")
+    assert result["matches"] == []
+    assert result["summary"] == "Search failed: chunk failed"
+
+def test_async_commit_search_merges_chunks(engine):
+    """The async search merges, reports failures and caps requests like the sync one"""
+    prompts = []
+    async def areply(provider, model, system, prompt, *args):
+        prompts.append(prompt)
+        return _search_reply(prompt)
+    engine._areply = areply
+    result = asyncio.run(engine.semantic_commit_search_async("anything", _SEARCH_HISTORY, "1"))
+    assert len(prompts) == 5
+    assert [match["commit_sha"] for match in result["matches"]] == ["c080", "c060", "c020", "c000"]
+    assert result["summary"] == "best is c080 (1 of 5 batches of commits could not be searched.)"
+
+@pytest.mark.parametrize("fragments, expected", [
+    # A bare object stops the stream as soon as it closes.
+    (['{"command": "git status"}', " trailing"], '{"command": "git status"}'),
+    (['  \n', '{"a": 1}', "ignored"], '  \n{"a": 1}'),
+    # Braces and escaped quotes inside strings do not close it.
+    (['{"command": "git log --format={%h}", "explanation": "}"}', "ignored"],
+     '{"command": "git log --format={%h}", "explanation": "}"}'),
+    (['{"explanation": "say \\"}\\" here"}', "ignored"], '{"explanation": "say \\"}\\" here"}'),
+    (['{"a": {"b": "{"}}', "ignored"], '{"a": {"b": "{"}}'),
+    # Objects, strings and escapes split across fragments.
+    (['{"com', 'mand": "git', ' status"}  extra', "ignored"], '{"command": "git status"}'),
+    (['{"a": "x\\', '"}', '"}tail', "ignored"], '{"a": "x\\"}"}'),
+    # Prose, non-JSON and unterminated replies are read to the end.
+    (['Here you go: {"a": 1}', " rest"], 'Here you go: {"a": 1} rest'),
+    (["git status", "\nShows the tree"], "git status\nShows the tree"),
+    (['{"a": {"b": 1}', " still open"], '{"a": {"b": 1} still open'),
+    ([], ""),
+])
+def test_collect_stream(engine, fragments, expected):
+    """Streamed replies are cut off only once a leading JSON object closes"""
+    seen = []
+    assert engine._collect_stream(iter(fragments), seen.append) == expected
+    assert "".join(seen).startswith(expected)
+    assert "ignored" not in seen
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": 1}', '{"a": 1}'),
+    ('Sure! {"a": {"b": [1, 2]}} and {"c": 3}', '{"a": {"b": [1, 2]}}'),
+    ('{"a": "}{"} tail}', '{"a": "}{"}'),
+    ('{"a": "say \\"}\\""} tail}', '{"a": "say \\"}\\""}'),
+    ('{"a": "ends in \\\\"} tail}', '{"a": "ends in \\\\"}'),
+    ('```json\n{"a": 1}\n```', '{"a": 1}'),
+    ("no json here", None),
+    ('{"a": {"b": 1}', None),
+    ('{"a": "}', None),
+])
+def test_extract_first_json(engine, text, expected):
+    """The first balanced object is found, ignoring braces and quotes inside strings"""
+    assert engine._extract_first_json(text) == expected
+
+_DEFAULT = {"summary": "default"}
+_FAILURE = {"summary": "failure"}
+
+@pytest.mark.parametrize("response, expected", [
+    ('{"summary": "ok"}', {"summary": "ok"}),
+    ('Here are the results:\n{"summary": "braces {} inside"}\nHope it helps.', {"summary": "braces {} inside"}),
+    ('{"summary": "quote \\" and }"} {"summary": "second"}', {"summary": 'quote " and }'}),
+    ("No matches at all.", _DEFAULT),
+    ('{"summary": "never closed"', _DEFAULT),
+    ("{not json}", _FAILURE),
+])
+def test_parse_json_response(engine, response, expected):
+    """Secondary replies parse their JSON object, else fall back to default or failure"""
+    assert engine._parse_json_response(response, _DEFAULT, _FAILURE) == expected
+    assert engine._is_json_reply(response) is (expected not in (_DEFAULT, _FAILURE))
+
+def _generate_concurrently(engine, generate, callers=5):
+    """Call generate_command from several threads while the first provider call is held open"""
+    started, release = threading.Event(), threading.Event()
+    calls = []
+    def dispatch(user_input, context, model_name, on_text):
+        calls.append(user_input)
+        started.set()
+        release.wait(5)
+        return generate()
+    engine._dispatch = {"1": (dispatch, "model")}
+    results = [None] * callers
+    def call(i):
+        results[i] = engine.generate_command("show status", {"branch": "main"}, "1")
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return calls, results
+
+def test_concurrent_identical_requests_share_one_call(engine):
+    """Followers wait for the leader's answer instead of sending their own request"""
+    calls, results = _generate_concurrently(engine, lambda: {"command": "git status", "explanation": "", "warning": None})
+    assert calls == ["show status"]
+    assert all(result == {"command": "git status", "explanation": "", "warning": None} for result in results)
+    results[0]["command"] = "changed"
+    assert results[1]["command"] == "git status"
+
+def test_concurrent_identical_requests_share_failure(engine):
+    """A failed leader call is reported to every follower"""
+    def fail():
+        raise RuntimeError("provider down")
+    calls, results = _generate_concurrently(engine, fail)
+    assert calls == ["show status"]
+    for result in results:
+        assert result["command"] is None
+        assert result["explanation"] == "Failed to generate command: provider down"
+
+def test_new_leader_rechecks_cache(engine):
+    """A caller that missed the cache just before the previous leader finished does not resend"""
+    engine._dispatch = {"1": (lambda *args: pytest.fail("the provider should not be asked"), "model")}
+    cached_command = engine._cached_command
+    def miss_once(user_input, context, model_choice):
+        # The previous leader stores its answer right after this caller's miss.
+        engine._cached_command = cached_command
+        engine._remember_command(user_input, context, model_choice, {"command": "git status"})
+        return None
+    engine._cached_command = miss_once
+    assert engine.generate_command("show status", {}, "1") == {"command": "git status"}
+
+def test_file_status_counts(git_repo):
+    """Renames, files changed in both columns and untracked files are each counted once"""
+    for name in ("old.txt", "both.txt"):
+        (git_repo / name).write_text(f"{name}\n")
+    _git(git_repo, "add", ".")
+    _git(git_repo, "commit", "-q", "-m", "Add files")
+    _git(git_repo, "mv", "old.txt", "new name.txt")
+    (git_repo / "both.txt").write_text("staged\n")
+    _git(git_repo, "add", "both.txt")
+    (git_repo / "both.txt").write_text("staged\nand not\n")
+    (git_repo / "README.md").write_text("changed\n")
+    (git_repo / "notes").mkdir()
+    for name in ("notes/a.txt", "notes/b.txt", "?? odd.txt"):
+        (git_repo / name).write_text("untracked\n")
+    counts = ContextAnalyzer(str(git_repo))._get_file_status_counts()
+    assert counts == {"staged_files": 2, "unstaged_files": 2, "untracked_files": 3}
+
+_CONFLICTED = """header line
+<<<<<<< HEAD
+ours one
+=======
+theirs one
+>>>>>>> feature
+shared middle
+<<<<<<< HEAD
+ours two
+=======
+theirs two
+>>>>>>> feature
+footer line
+"""
+
+def test_conflict_hunks(git_repo):
+    """Only conflict regions are excerpted, capped at max_chars, else the start of the file"""
+    (git_repo / "conflicted.txt").write_text(_CONFLICTED)
+    (git_repo / "clean.txt").write_text("line\n" * 100)
+    analyzer = ContextAnalyzer(str(git_repo))
+    hunks = analyzer.get_conflict_hunks("conflicted.txt")
+    assert hunks == (
+        "<<<<<<< HEAD\nours one\n=======\ntheirs one\n>>>>>>> feature\n"
+        "<<<<<<< HEAD\nours two\n=======\ntheirs two\n>>>>>>> feature\n"
+    )
+    assert analyzer.get_conflict_hunks("conflicted.txt", max_chars=30) == hunks[:30]
+    assert analyzer.get_conflict_hunks("clean.txt", max_chars=12) == "line\nline\nli"
+
+@pytest.mark.parametrize("response, expected", [
+    ("Shows the tree.\nCareful, warning: untracked files.\nCareful, warning: untracked files.\ngit status",
+     {"command": "git status", "explanation": "Shows the tree. Careful, warning: untracked files.",
+      "warning": "Careful, warning: untracked files."}),
+    ("Same line\nSame line\nWarning: force pushes rewrite history\nRun `git push --force`",
+     {"command": "git push --force", "explanation": "Same line Same line",
+      "warning": "Warning: force pushes rewrite history"}),
+])
+def test_parse_text_reply_keeps_repeated_lines(engine, response, expected):
+    """Only the line reported as the warning leaves the explanation, not its repeats"""
+    assert engine._parse_ai_response(response) == expected
+
 def main():
     """Run all tests"""
     console.print("🚀 GitPilot 2.0.0 Feature Test Suite", style="bold green")